@@ -1,5 +1,6 @@
 from .attributes import AttributeConfigMixin, NcAttributes
 from .dataset import ConfigState, DatasetBase, DatasetConfigBase
+from .encoding import NcEncoding, NcEncodingMixin
 from .pipeline import PipelineConfig
 
 __all__ = [
@@ -8,5 +9,7 @@ __all__ = [
     "DatasetBase",
     "DatasetConfigBase",
     "ConfigState",
+    "NcEncoding",
+    "NcEncodingMixin",
     "PipelineConfig",
 ]
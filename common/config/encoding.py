@@ -0,0 +1,94 @@
+from typing import Annotated, Literal
+
+import numpy as np
+import xarray as xr
+from pydantic import BaseModel, Field
+
+
+class NcEncoding(BaseModel):
+    """Configure compression, chunking, and data types when writing NetCDFs"""
+
+    compression: Annotated[
+        Literal["zlib", "zstd"] | None,
+        Field(description="Compression to apply to data variables"),
+    ] = "zlib"
+    complevel: Annotated[
+        int,
+        Field(description="Compression level", ge=1, le=9),
+    ] = 4
+    shuffle: Annotated[
+        bool,
+        Field(description="Apply the byte shuffle filter before compressing"),
+    ] = True
+    time_chunk: Annotated[
+        int | None,
+        Field(description="Chunk size along the time dimension"),
+    ] = 4096
+    float32: Annotated[
+        bool,
+        Field(description="Store 64 bit float variables as 32 bit floats"),
+    ] = False
+
+    def encoding_for(
+        self,
+        ds: xr.Dataset,
+        time_dim: str = "time",
+        unlimited_dims: list[str] | None = None,
+    ) -> dict[str, dict]:
+        """Build an encoding for `Dataset.to_netcdf` for numeric data variables"""
+        unlimited_dims = unlimited_dims or []
+        encoding = {}
+
+        for name, var in ds.data_vars.items():
+            if var.dtype.kind not in "biuf" or var.ndim == 0:
+                continue
+
+            var_encoding = {}
+
+            if self.compression is not None:
+                var_encoding["compression"] = self.compression
+                var_encoding["complevel"] = self.complevel
+                var_encoding["shuffle"] = self.shuffle
+
+            if self.time_chunk and time_dim in var.dims:
+                var_encoding["chunksizes"] = tuple(
+                    self.chunk_size(dim, var.sizes[dim], time_dim, unlimited_dims)
+                    for dim in var.dims
+                )
+
+            if self.float32 and var.dtype == np.float64:
+                var_encoding["dtype"] = "float32"
+                var_encoding["_FillValue"] = np.float32(np.nan)
+
+            encoding[name] = var_encoding
+
+        return encoding
+
+    def chunk_size(
+        self,
+        dim: str,
+        size: int,
+        time_dim: str,
+        unlimited_dims: list[str],
+    ) -> int:
+        """Chunk size for a dimension. Only unlimited dimensions can have chunks larger than their size.
+
+        Chunks need at least one element, even along empty dimensions.
+        """
+        if dim != time_dim:
+            return max(1, size)
+        if dim in unlimited_dims:
+            return self.time_chunk
+        return max(1, min(self.time_chunk, size))
+
+
+class NcEncodingMixin:
+    """Mixin to add NetCDF encoding configuration to a dataset"""
+
+    nc_encoding: Annotated[
+        NcEncoding,
+        Field(
+            default_factory=NcEncoding,
+            description="Compression and chunking for NetCDF outputs",
+        ),
+    ]
@@ -1,5 +1,8 @@
-from typing import Annotated, Literal
+import re
+from collections.abc import Iterable
+from typing import Annotated, ClassVar, Literal
 
+import numpy as np
 import pandas as pd
 from pydantic import BaseModel, Field
 
@@ -33,6 +36,124 @@ class VariableMappingMixin:
     ]
 
 
+class RenamePlan:
+    """How each output column is built when renaming with variable mappings.
+
+    Mappings are applied in order, so a later mapping can rename an earlier
+    one's output. Columns that end up with the same name are coalesced to
+    the first non-null value across them, starting with a column that
+    already had the output name, then mapped sources in mapping order.
+    """
+
+    def __init__(self, variable_mappings: list[VarMap]):
+        self.variable_mappings = variable_mappings
+
+        # Current name of each source column as the mappings are applied
+        names = {name: name for name in (vm.source for vm in variable_mappings)}
+        # Source columns that each mapping renames
+        self.renamed_by: list[set[str]] = []
+        for var_map in variable_mappings:
+            self.renamed_by.append(
+                {source for source, name in names.items() if name == var_map.source},
+            )
+            names = {
+                source: var_map.output if name == var_map.source else name
+                for source, name in names.items()
+            }
+
+        self.final_names = {
+            source: name for source, name in names.items() if source != name
+        }
+
+        # Position of each renamed source in the mappings
+        self.variable_mappings_order = {
+            source: n for n, source in enumerate(self.final_names)
+        }
+
+        self.sources: dict[str, list[str]] = {}
+        for source, output in self.final_names.items():
+            self.sources.setdefault(output, []).append(source)
+
+    @property
+    def collisions(self) -> dict[str, list[str]]:
+        """Outputs that more than one source column is mapped to"""
+        return {
+            output: sources
+            for output, sources in self.sources.items()
+            if len(sources) > 1
+        }
+
+    def missing_sources(self, columns: Iterable[str]) -> list[str]:
+        """Mapping sources that there isn't a column for when they are applied"""
+        columns = set(columns)
+        return [
+            var_map.source
+            for var_map, renamed in zip(
+                self.variable_mappings,
+                self.renamed_by,
+                strict=True,
+            )
+            if renamed.isdisjoint(columns)
+        ]
+
+    def collisions_in(self, columns: Iterable[str]) -> dict[str, list[str]]:
+        """Output names shared by several of the columns, with those columns"""
+        by_name: dict[str, list[str]] = {}
+        for column in columns:
+            by_name.setdefault(self.final_names.get(column, column), []).append(
+                column,
+            )
+        return {name: group for name, group in by_name.items() if len(group) > 1}
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Rename the columns of a dataframe, coalescing any that collide"""
+        names = [self.final_names.get(column, column) for column in df.columns]
+        if len(set(names)) == len(names):
+            return df.set_axis(names, axis=1)
+
+        positions: dict[str, list[int]] = {}
+        for position, name in enumerate(names):
+            positions.setdefault(name, []).append(position)
+
+        columns = {}
+        for name, group in positions.items():
+            if len(group) == 1:
+                columns[name] = df.iloc[:, group[0]]
+                continue
+
+            group = sorted(
+                group,
+                key=lambda position: self.priority(df.columns[position]),
+            )
+            columns[name] = coalesce(
+                [df.iloc[:, position].to_numpy() for position in group],
+            )
+
+        return pd.DataFrame(columns, index=df.index)
+
+    def priority(self, column: str) -> int:
+        """Order a column is used in when coalescing, lowest first"""
+        if column not in self.final_names:
+            return 0
+        return 1 + self.variable_mappings_order[column]
+
+
+def coalesce(columns: list[np.ndarray]) -> np.ndarray:
+    """First non-null value across the columns, for each row"""
+    values = columns[0]
+    for other in columns[1:]:
+        missing = pd.isna(values)
+        if not missing.any():
+            break
+        try:
+            dtype = np.result_type(values.dtype, other.dtype)
+        except TypeError:
+            dtype = np.dtype(object)
+        values = values.astype(dtype)
+        values[missing] = other[missing]
+    return values
+
+
 class DepthMap(BaseModel):
     """Configure depth mapping for a single variable"""
 
@@ -93,9 +214,29 @@ class OptionalDepthMappingMixin:
 class VariableConverter(BaseModel):
     converter_type: str
 
+    # Does `apply` modify the frame it is given, rather than returning a new one
+    in_place: ClassVar[bool] = False
+
     def convert(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Convert a copy of the dataframe"""
+        return self.apply(df.copy() if self.in_place else df)
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Convert the dataframe, modifying it if the converter works `in_place`"""
         raise NotImplementedError
 
+    def input_columns(self) -> set[str]:
+        """Columns the converter reads"""
+        return set()
+
+    def output_columns(self) -> set[str]:
+        """Columns the converter creates"""
+        return set()
+
+    def source_columns(self, needed: set[str]) -> set[str]:
+        """Input columns needed to produce the `needed` output columns"""
+        return needed
+
 
 class SplitOperator(VariableConverter):
     """Takes the source variable, splits it on the separator and  maps the resulting array to new variables"""
@@ -127,8 +268,15 @@ class SplitOperator(VariableConverter):
         ),
     ]
 
-    def convert(self, df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
+    in_place: ClassVar[bool] = True
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        if self.is_fast_path():
+            for n_var, values in self.split_numeric(df[self.source_variable]).items():
+                df[self.output_variables[n_var]] = values
+            df = df.drop(columns=self.source_variable)
+            return df
+
         splt_col = df[self.source_variable].str.split(
             self.sep,
             expand=True,
@@ -137,9 +285,59 @@ class SplitOperator(VariableConverter):
             df[self.output_variables[n_var]] = splt_col[n_var].astype(
                 self.col_data_type,
             )
-        df = df.drop(self.source_variable, axis=1)
+        df = df.drop(columns=self.source_variable)
         return df
 
+    def is_fast_path(self) -> bool:
+        """Can the source be split without building a frame of every part.
+
+        Only float outputs with a literal separator are split this way.
+        pandas treats separators longer than a character as regexes.
+        """
+        try:
+            dtype = pd.api.types.pandas_dtype(self.col_data_type)
+        except TypeError:
+            return False
+        literal_sep = len(self.sep) == 1 or re.escape(self.sep) == self.sep
+        return pd.api.types.is_float_dtype(dtype) and literal_sep
+
+    def split_numeric(self, source: pd.Series) -> dict[int, pd.Series]:
+        """Parse the requested parts of each value straight to the output dtype.
+
+        Values are partitioned on the separator up to the highest requested
+        index, so later parts are never split. Missing parts and values
+        that aren't numbers become NaN.
+        """
+        # Go through objects, as converting a string column with missing
+        # values straight to a fixed width str array truncates the values
+        rest = np.asarray(
+            source.fillna("").astype(str).to_numpy(dtype=object),
+            dtype=str,
+        )
+        parts = {}
+        for n in range(max(self.output_variables) + 1):
+            partitioned = np.char.partition(rest, self.sep)
+            if n in self.output_variables:
+                parts[n] = pd.to_numeric(
+                    pd.Series(partitioned[..., 0], index=source.index),
+                    errors="coerce",
+                ).astype(self.col_data_type)
+            rest = partitioned[..., 2]
+        return parts
+
+    def input_columns(self) -> set[str]:
+        return {self.source_variable}
+
+    def output_columns(self) -> set[str]:
+        return set(self.output_variables.values())
+
+    def source_columns(self, needed: set[str]) -> set[str]:
+        """The source variable is needed if any of the split variables are"""
+        outputs = set(self.output_variables.values())
+        if needed & outputs:
+            return (needed - outputs) | {self.source_variable}
+        return needed
+
 
 class ProfileDepthMappings(BaseModel):
     depth: Annotated[
@@ -167,15 +365,38 @@ class ProfileConverter(VariableConverter):
         ),
     ]
 
-    def convert(self, df: pd.DataFrame) -> pd.DataFrame:
-        daily_dfs = []
-        all_profile_vars = [
-            var
-            for depth_conf in self.profile_data
-            for var in depth_conf.mappings.keys()
-        ]
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Reshape to one row per time and depth, with depth blocks one after another"""
+        non_profile_vars = df.columns.difference(list(self.input_columns())).tolist()
+        if not self.is_uniform(df, non_profile_vars):
+            return self.apply_concat(df, non_profile_vars)
+
+        n_rows = len(df)
+        n_depths = len(self.profile_data)
 
-        non_profile_vars = df.columns.difference(all_profile_vars).tolist()
+        # Non-profile columns are tiled once, keeping the index like concat does
+        result = df[non_profile_vars].take(np.tile(np.arange(n_rows), n_depths))
+
+        for output, sources in self.profile_columns().items():
+            # Depth blocks are the columns of the profile block, so read it
+            # column by column to stack them one after another
+            result[output] = df[sources].to_numpy().ravel(order="F")
+
+        if self.profile_data[0].depth is not None:
+            result["depth"] = np.repeat(
+                np.array([depth.depth for depth in self.profile_data], dtype=float),
+                n_rows,
+            )
+
+        return result
+
+    def apply_concat(
+        self,
+        df: pd.DataFrame,
+        non_profile_vars: list[str],
+    ) -> pd.DataFrame:
+        """Reshape depth by depth, for mappings that differ between depths"""
+        daily_dfs = []
         for depth in self.profile_data:
             keep = non_profile_vars + list(depth.mappings.keys())
 
@@ -190,16 +411,70 @@ class ProfileConverter(VariableConverter):
 
         return pd.concat(daily_dfs)
 
+    def profile_columns(self) -> dict[str, list[str]]:
+        """Source columns for each output variable, in depth order"""
+        columns = {output: [] for output in self.profile_data[0].mappings.values()}
+        for depth in self.profile_data:
+            for source, output in depth.mappings.items():
+                columns[output].append(source)
+        return columns
+
+    def is_uniform(self, df: pd.DataFrame, non_profile_vars: list[str]) -> bool:
+        """Can the profile block be reshaped in one go.
+
+        Every depth needs to map to the same output variables, and either all
+        or none of them have a fixed depth. Source columns need NumPy dtypes,
+        and output names can't collide with other columns.
+        """
+        if not self.profile_data or not df.columns.is_unique:
+            return False
+
+        outputs = list(self.profile_data[0].mappings.values())
+        has_depth = self.profile_data[0].depth is not None
+        for depth in self.profile_data:
+            values = list(depth.mappings.values())
+            if len(set(values)) != len(values) or set(values) != set(outputs):
+                return False
+            if (depth.depth is not None) != has_depth:
+                return False
+
+        if {"depth", *outputs} & set(non_profile_vars):
+            return False
+
+        return all(
+            isinstance(df[source].dtype, np.dtype)
+            for depth in self.profile_data
+            for source in depth.mappings
+            if source in df.columns
+        )
+
+    def input_columns(self) -> set[str]:
+        return {var for depth in self.profile_data for var in depth.mappings}
+
+    def output_columns(self) -> set[str]:
+        return {"depth"} | {
+            var for depth in self.profile_data for var in depth.mappings.values()
+        }
+
+    def source_columns(self, needed: set[str]) -> set[str]:
+        """Profile variables are needed if their output variables are"""
+        outputs = {"depth"}
+        sources = set()
+        for depth in self.profile_data:
+            for source, output in depth.mappings.items():
+                outputs.add(output)
+                if output in needed:
+                    sources.add(source)
+        return (needed - outputs) | sources
+
 
 class DropColumns(VariableConverter):
     converter_type: Literal["drop"] = "drop"
 
     column_names: list[str]
 
-    def convert(self, df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
-        df = df.drop(columns=self.column_names)
-        return df
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df.drop(columns=self.column_names)
 
 
 class VariableConverterMixIn:
@@ -214,3 +489,81 @@ class VariableConverterMixIn:
             description="List of variable conversion steps",
         ),
     ] = None
+
+
+def converter_source_columns(
+    converters: list[VariableConverter] | None,
+    needed: set[str],
+) -> set[str]:
+    """Input columns needed for converters to produce the `needed` columns"""
+    for converter in reversed(converters or []):
+        needed = converter.source_columns(needed)
+    return needed
+
+
+class ConverterPlan:
+    """A chain of variable converters, compiled to copy the data as little as possible.
+
+    Dropped columns are removed before any converter that doesn't read or
+    create them, all at once. The frame passed to `run` is copied at most
+    once, before the first converter that works in place, and only if
+    nothing has returned a new frame already.
+
+    If only `read_columns` were read from the source, dropped columns
+    outside of them may already be missing. Other missing columns raise.
+    """
+
+    def __init__(
+        self,
+        converters: list[VariableConverter] | None,
+        read_columns: set[str] | None = None,
+    ):
+        self.read_columns = read_columns
+        self.drop_columns: list[str] = []
+        self.steps: list[VariableConverter] = []
+
+        for converter in converters or []:
+            if not isinstance(converter, DropColumns):
+                self.steps.append(converter)
+                continue
+
+            later = []
+            for column in converter.column_names:
+                if any(
+                    column in step.input_columns() or column in step.output_columns()
+                    for step in self.steps
+                ):
+                    later.append(column)
+                elif column not in self.drop_columns:
+                    self.drop_columns.append(column)
+
+            if later:
+                self.steps.append(DropColumns(column_names=later))
+
+    def run(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Convert a dataframe, without modifying it"""
+        owned = False
+        if self.drop_columns:
+            df = df.drop(columns=self.columns_to_drop(df, self.drop_columns))
+            owned = True
+
+        for step in self.steps:
+            if isinstance(step, DropColumns):
+                df = df.drop(columns=self.columns_to_drop(df, step.column_names))
+            else:
+                if step.in_place and not owned:
+                    df = df.copy()
+                df = step.apply(df)
+            owned = True
+
+        return df
+
+    def columns_to_drop(self, df: pd.DataFrame, columns: list[str]) -> list[str]:
+        """Columns to drop, leaving out those that weren't read from the source"""
+        if self.read_columns is None:
+            return columns
+        return [
+            column
+            for column in columns
+            if column in df.columns or column in self.read_columns
+        ]
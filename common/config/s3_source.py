@@ -11,6 +11,15 @@ class S3SourceConfig(BaseModel):
         str,
         Field(description="The S3 prefix/folder where files are located"),
     ] = "/"
+    notification_queue_url: Annotated[
+        str | None,
+        Field(
+            description=(
+                "URL of an SQS queue that receives the bucket's ObjectCreated "
+                "event notifications, to trigger updates as files arrive"
+            ),
+        ),
+    ] = None
     # region: Annotated[
     #     str,
     #     Field(description="The AWS region where the bucket is located"),
@@ -0,0 +1,119 @@
+"""Schema driven numeric coercion for dataframes.
+
+Sources frequently deliver numeric columns as text, with sentinel
+strings (`NAN`, `No data`, ...) in place of missing values.
+Rather than trying to convert every column of every frame,
+`NumericCoercer` infers which columns are numeric the first time it
+sees them, caches that schema, and then converts the text columns
+of later frames in one batched NumPy pass.
+"""
+
+from typing import Annotated
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, Field, PrivateAttr
+
+
+class NumericCoercer(BaseModel):
+    """Convert text columns to numeric dtypes using a cached column schema"""
+
+    na_values: Annotated[
+        list[str] | None,
+        Field(
+            description=(
+                "Sentinel values that mark a missing value. "
+                "If set, rows with missing or sentinel values are dropped."
+            ),
+        ),
+    ] = None
+    ignore_columns: Annotated[
+        list[str],
+        Field(
+            description="Columns that should be neither NA checked nor converted",
+            default_factory=list,
+        ),
+    ]
+
+    # Column name to numeric dtype, or None if the column is not numeric
+    _schema: dict[str, str | None] = PrivateAttr(default_factory=dict)
+    # Column name to the most recent conversion error
+    _failures: dict[str, str] = PrivateAttr(default_factory=dict)
+
+    @property
+    def schema(self) -> dict[str, str | None]:
+        """The inferred column schema"""
+        return self._schema
+
+    @property
+    def failures(self) -> dict[str, str]:
+        """Columns that could not be converted to numeric, and why"""
+        return self._failures
+
+    def drop_na_rows(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Drop rows that have a missing value or NA sentinel in any checked column"""
+        if self.na_values is None:
+            return df
+
+        checked = df.columns.difference(self.ignore_columns, sort=False)
+        missing = df[checked].isna().to_numpy()
+
+        # Sentinels are strings, so they can only appear in non-numeric columns
+        text_columns = [c for c in checked if not pd.api.types.is_numeric_dtype(df[c])]
+        if text_columns:
+            sentinels = df[text_columns].isin(self.na_values).to_numpy()
+            return df[~(missing.any(axis=1) | sentinels.any(axis=1))]
+
+        return df[~missing.any(axis=1)]
+
+    def infer(self, df: pd.DataFrame) -> None:
+        """Add any columns not yet in the schema"""
+        for c in df.columns:
+            if c in self._schema or c in self.ignore_columns:
+                continue
+
+            if pd.api.types.is_numeric_dtype(df[c]):
+                self._schema[c] = str(df[c].dtype)
+                continue
+
+            try:
+                self._schema[c] = str(pd.to_numeric(df[c]).dtype)
+            except (ValueError, TypeError) as e:
+                self._schema[c] = None
+                self._failures[c] = str(e)
+
+    def coerce(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Drop NA rows and convert columns to their numeric schema dtypes"""
+        df = self.drop_na_rows(df)
+        self.infer(df)
+
+        to_convert = [
+            c
+            for c in df.columns
+            if self._schema.get(c) is not None
+            and not pd.api.types.is_numeric_dtype(df[c])
+        ]
+        if not to_convert:
+            return df
+
+        df = df.copy()
+
+        float_columns = [c for c in to_convert if self._schema[c] == "float64"]
+        other_columns = [c for c in to_convert if c not in float_columns]
+
+        if float_columns:
+            try:
+                values = df[float_columns].to_numpy(dtype=object).astype(np.float64)
+                df[float_columns] = values
+            except (ValueError, TypeError):
+                # Something in the block didn't parse, so work out which
+                # columns are at fault and convert the rest individually.
+                other_columns = float_columns + other_columns
+
+        for c in other_columns:
+            try:
+                df[c] = pd.to_numeric(df[c])
+            except (ValueError, TypeError) as e:
+                self._failures[c] = str(e)
+
+        return df
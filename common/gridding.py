@@ -0,0 +1,76 @@
+"""Grid long format profile data onto (time, depth) arrays.
+
+`df.set_index(["time", "depth"]).to_xarray()` goes through a MultiIndex
+and reindexes every column onto the full product of its levels, which is
+slow and memory heavy for months of irregular profiles. `grid_profile`
+instead finds the unique times and depths once, and scatters each
+column into a preallocated array with the same integer indexers.
+"""
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+
+def grid_profile(
+    df: pd.DataFrame,
+    time_var: str = "time",
+    depth_var: str = "depth",
+) -> xr.Dataset:
+    """Grid a frame with a row per time and depth into a (time, depth) dataset.
+
+    Every other column becomes a 2-D variable. Cells without a row are
+    missing, so integer columns are widened to floats when there are gaps.
+    When a time and depth has several rows, the first one is kept.
+    Rows without a time or depth are dropped.
+    """
+    valid = (df[time_var].notna() & df[depth_var].notna()).to_numpy()
+    if not valid.all():
+        df = df[valid]
+
+    time_codes, times = pd.factorize(df[time_var], sort=True)
+    depth_codes, depths = pd.factorize(df[depth_var], sort=True)
+    shape = (len(times), len(depths))
+
+    cells = np.ravel_multi_index((time_codes, depth_codes), shape)
+    rows_per_cell = np.bincount(cells, minlength=shape[0] * shape[1])
+    complete = bool(rows_per_cell.all())
+    rows = None
+    if rows_per_cell.max(initial=0) > 1:
+        # Keep the first row for each cell
+        _, rows = np.unique(cells, return_index=True)
+        time_codes = time_codes[rows]
+        depth_codes = depth_codes[rows]
+    del cells, rows_per_cell
+
+    data_vars = {}
+    for column in df.columns:
+        if column in (time_var, depth_var):
+            continue
+
+        values = df[column].to_numpy()
+        if rows is not None:
+            values = values[rows]
+        if complete:
+            grid = np.empty(shape, dtype=values.dtype)
+        else:
+            dtype, fill_value = missing_dtype(values.dtype)
+            grid = np.full(shape, fill_value, dtype=dtype)
+        grid[time_codes, depth_codes] = values
+
+        data_vars[column] = ((time_var, depth_var), grid)
+
+    return xr.Dataset(
+        data_vars, coords={time_var: times.to_numpy(), depth_var: depths.to_numpy()}
+    )
+
+
+def missing_dtype(dtype: np.dtype) -> tuple[np.dtype, object]:
+    """Dtype that can hold missing values, and the value to fill them with"""
+    if dtype.kind in "mM":
+        return dtype, np.array("NaT", dtype=dtype)
+    if dtype.kind in "fc":
+        return dtype, np.nan
+    if dtype.kind in "iu":
+        return np.dtype("float64"), np.nan
+    return np.dtype(object), np.nan
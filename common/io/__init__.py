@@ -7,13 +7,22 @@ from pathlib import Path
 import dagster as dg
 
 # from ..resources.s3fs_resource import S3FSResource
+from .base import LAZY_PARTITIONS_TYPE, PARTITION_ITERATOR_TYPE  # noqa: F401
 from .csv_io import PandasCsvIoManager
 from .datastore import Datastore
 from .json_io import JsonIOManager
 from .nc_io import XarrayNcIoManager
+from .parquet_io import PandasParquetIoManager
 from .tags import (
     ALLOW_MISSING_PARTITIONS,  # noqa: F401
+    APPEND_DIM,  # noqa: F401
+    CHECKSUM,  # noqa: F401
+    CHUNKS,  # noqa: F401
+    COLUMNS,  # noqa: F401
+    CSV_EXPORT_PATH,  # noqa: F401
     DESIRED_PATH,  # noqa: F401
+    INCREMENTAL_TARGET_PATH,  # noqa: F401
+    NC_ENCODING,  # noqa: F401
     OUTPUT_PATH,  # noqa: F401
     S3_DESIRED_PATH,  # noqa: F401
     S3_OUTPUT_PATH,  # noqa: F401
@@ -24,6 +33,7 @@ from .tags import (
 CSV_KEY = "csv_io"
 JSON_KEY = "json_io"
 NETCDF_KEY = "netcdf_io"
+PARQUET_KEY = "parquet_io"
 
 CSV_ASSET_KWARGS = {
     "io_manager_key": CSV_KEY,
@@ -42,6 +52,12 @@ NETCDF_ASSET_KWARGS = {
     "tags": {"dagster/storage_kind": "NetCDF"},
 }
 
+PARQUET_ASSET_KWARGS = {
+    "io_manager_key": PARQUET_KEY,
+    "compute_kind": "pandas",
+    "tags": {"dagster/storage_kind": "parquet"},
+}
+
 # MetOcean OSO development public bucket
 OSO_DEV_BUCKET = "ioos-ott-oso-dev-public"
 
@@ -100,6 +116,7 @@ def common_resources(
         CSV_KEY: PandasCsvIoManager(**io_kwargs),
         JSON_KEY: JsonIOManager(**io_kwargs),
         NETCDF_KEY: XarrayNcIoManager(**io_kwargs),
+        PARQUET_KEY: PandasParquetIoManager(**io_kwargs),
     }
 
     return datastore, io_managers
@@ -7,21 +7,36 @@ adaptions to allow the use of path templates, instead of letting
 UPathIOManager make things up on its own.
 """
 
+import errno
+import hashlib
+import os
+import shutil
+import time
+import uuid
 from abc import abstractmethod
-from collections.abc import Mapping
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
 from typing import Any
 
 import dagster as dg
 import pandas as pd
+from pydantic import Field
 
-# from pydantic import Field
 # from common import paths
 # from ..resources.s3fs_resource import S3FSResource
 # from .tags import ALLOW_MISSING_PARTITIONS, DESIRED_PATH, OUTPUT_PATH
 from . import tags
 from .datastore import Datastore
 
+# When the inputs of incremental outputs started loading, by output path.
+# A step loads its inputs and handles its outputs in the same process,
+# but with different IO managers, so this is kept at the module level.
+_loading_started: dict[Path, float] = {}
+
 
 class PartitionedInputError(Exception):
     """An error that is raised when the input is partitioned
@@ -41,6 +56,11 @@ class IOManagerBase(dg.ConfigurableIOManager):
     """
 
     datastore: Datastore
+    max_partition_workers: int = Field(
+        8,
+        ge=1,
+        description="Maximum number of partitions to load at once",
+    )
 
     # sync_to_s3_bucket: Optional[str] = Field(
     #     None,
@@ -57,7 +77,7 @@ class IOManagerBase(dg.ConfigurableIOManager):
         if (
             isinstance(context, dg.InputContext)
             and context.has_asset_partitions
-            and is_dict_type(context.dagster_type.typing_type)
+            and partition_collection_kind(context.dagster_type)
         ):
             raise PartitionedInputError(
                 "Input is partitioned, make sure the partition manager knows how to handle it",
@@ -138,7 +158,18 @@ class IOManagerBase(dg.ConfigurableIOManager):
         It will also handle the S3 sync if the sync_to_s3_bucket or a S3 path is set.
         """
         path = self.get_path(context)
-        self.dump_to_path(context, obj, path)
+        loading_started = _loading_started.pop(path, None)
+        with self.atomic_path(
+            context,
+            path,
+            copy_existing=self.updates_in_place(context),
+        ) as temp_path:
+            self.dump_to_path(context, obj, temp_path)
+
+        if loading_started is not None:
+            # Partitions written while the inputs were being loaded
+            # are then newer than the output, and are loaded next time
+            os.utime(path, (loading_started, loading_started))
 
         # if s3_path := self.get_s3_path(context, path):
         #     try:
@@ -190,6 +221,37 @@ class IOManagerBase(dg.ConfigurableIOManager):
     #         return f"s3://{self.sync_to_s3_bucket}/{path}"
     #     return None
 
+    def updates_in_place(self, context: dg.OutputContext) -> bool:
+        """Whether `dump_to_path` updates an existing file, rather than replacing it"""
+        return False
+
+    @contextmanager
+    def atomic_path(
+        self,
+        context: dg.OutputContext,
+        path: Path,
+        checksum_key: str = tags.CHECKSUM,
+        copy_existing: bool = False,
+    ) -> Iterator[Path]:
+        """Yield a scratch path to write to, that is then renamed into place.
+
+        Readers never see a partially written file at `path`, and the
+        file's checksum is recorded in the output metadata.
+        If `copy_existing` is set, the current file is copied to scratch
+        first so that it can be updated.
+        """
+        with self.datastore.temp_dir() as temp_dir:
+            temp_path = temp_dir / path.name
+            if copy_existing and path.exists():
+                shutil.copy2(path, temp_path)
+
+            yield temp_path
+
+            checksum = file_checksum(temp_path)
+            replace_path(temp_path, path)
+
+        context.add_output_metadata({checksum_key: checksum})
+
     @abstractmethod
     def load_from_path(self, context: dg.InputContext, path: Path):
         """Load input from a given path"""
@@ -200,47 +262,244 @@ class IOManagerBase(dg.ConfigurableIOManager):
             path = self.get_path(context)
             return self.load_from_path(context, path)
         except PartitionedInputError:
-            partition_keys = context.asset_partition_keys
+            partition_keys = self.partition_keys_to_load(context)
+            paths = {key: self.get_output_path(context, key) for key in partition_keys}
+
+            kind = partition_collection_kind(context.dagster_type)
+            if kind != "dict":
+                for key, path in list(paths.items()):
+                    if not path.exists():
+                        self.handle_missing_partition(context, key, path)
+                        del paths[key]
+
+                partitions = LazyPartitionMapping(
+                    lambda path: self.load_from_path(context, path),
+                    paths,
+                    max_workers=self.max_partition_workers,
+                )
+                if kind == "iterator":
+                    return iter(partitions.items())
+                return partitions
 
             partition_map = {}
 
-            allow_missing_partitons = context.metadata.get(
-                tags.ALLOW_MISSING_PARTITIONS,
-                False,
-            )
-
-            for key in partition_keys:
-                path = self.get_output_path(context, key)
-
+            # Reads from EFS are latency bound, so load partitions concurrently,
+            # but collect them in partition key order.
+            with ThreadPoolExecutor(
+                max_workers=self.max_partition_workers,
+            ) as executor:
+                futures = {
+                    key: executor.submit(self.load_from_path, context, path)
+                    for key, path in paths.items()
+                }
+
+            for key, future in futures.items():
                 try:
-                    obj = self.load_from_path(context, path)
-                    partition_map[key] = obj
+                    partition_map[key] = future.result()
                 except FileNotFoundError as e:
-                    if allow_missing_partitons:
-                        context.log.warning(
-                            f"Could not find {path} for partition key {key}",
-                        )
-                    else:
-                        msg = (
-                            f"Could not find {path} for partition key {key}. "
-                            "Set `AssetIn(metadata={io.ALLOW_MISSING_PARTITIONS=True})` "
-                            " if this should be allowed."
-                        )
-                        raise FileNotFoundError(msg) from e
+                    self.handle_missing_partition(context, key, paths[key], e)
 
             return partition_map
 
+    def handle_missing_partition(
+        self,
+        context: dg.InputContext,
+        key: str,
+        path: Path,
+        error: FileNotFoundError | None = None,
+    ) -> None:
+        """Warn about a missing partition if allowed, otherwise raise"""
+        allow_missing_partitons = context.metadata.get(
+            tags.ALLOW_MISSING_PARTITIONS,
+            False,
+        )
 
-def is_dict_type(type_obj) -> bool:
-    """Check if a type is a dict or a reasonable subclass"""
-    if isinstance(type_obj, dict):
-        return True
+        if allow_missing_partitons:
+            context.log.warning(
+                f"Could not find {path} for partition key {key}",
+            )
+        else:
+            msg = (
+                f"Could not find {path} for partition key {key}. "
+                "Set `AssetIn(metadata={io.ALLOW_MISSING_PARTITIONS=True})` "
+                " if this should be allowed."
+            )
+            raise FileNotFoundError(msg) from error
 
+    def incremental_target_path(self, context: dg.InputContext) -> Path | None:
+        """Path of the downstream output that partitions are incrementally merged into"""
+        target_template = context.definition_metadata.get(
+            tags.INCREMENTAL_TARGET_PATH,
+        )
+        if not target_template or not context.has_partition_key:
+            return None
+
+        formatting_context = self.get_path_formatting_context(
+            context,
+            partition_key=context.partition_key,
+        )
+        return self.datastore.dataset_path() / target_template.format_map(
+            formatting_context,
+        )
+
+    def partition_keys_to_load(self, context: dg.InputContext) -> list[str]:
+        """Partition keys that need to be loaded for a partitioned input.
+
+        If the input sets `io.INCREMENTAL_TARGET_PATH`, then only partitions
+        that have changed since the target was last written are loaded.
+        If a partition older than the newest unchanged partition has changed,
+        all partitions are loaded so the target can be fully rebuilt.
+        """
+        partition_keys = list(context.asset_partition_keys)
+
+        target = self.incremental_target_path(context)
+        if target is None:
+            return partition_keys
+
+        # Record when loading started, so that partitions written while
+        # the downstream asset is running are picked up next time.
+        # It's only applied to the target once it has been written.
+        _loading_started[target] = time.time()
+
+        try:
+            target_mtime = target.stat().st_mtime
+        except FileNotFoundError:
+            return partition_keys
+
+        unchanged = []
+        changed = []
+        for key in partition_keys:
+            try:
+                mtime = self.get_output_path(context, key).stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if mtime > target_mtime:
+                changed.append(key)
+            else:
+                unchanged.append(key)
+
+        if not changed:
+            context.log.info(f"No changed partitions found for {target}, rebuilding")
+            return partition_keys
+
+        if unchanged and min(changed) < max(unchanged):
+            context.log.info(
+                f"Partition {min(changed)} changed before {max(unchanged)}, "
+                f"fully rebuilding {target}",
+            )
+            return partition_keys
+
+        context.log.info(f"Incrementally loading partitions {changed} for {target}")
+        return changed
+
+
+def file_checksum(path: Path) -> str:
+    """SHA-256 checksum of a file"""
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return f"sha256:{digest.hexdigest()}"
+
+
+def replace_path(source: Path, destination: Path) -> None:
+    """Atomically move source to destination.
+
+    If they are on different filesystems, the file is first copied
+    next to the destination, and then renamed.
+    """
     try:
-        if type_obj.__origin__ in {dict, Mapping}:
-            return True
+        source.replace(destination)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        staging = destination.with_name(f".{destination.name}.{uuid.uuid4().hex}")
+        shutil.copy2(source, staging)
+        staging.replace(destination)
+        source.unlink()
+
+
+class LazyPartitionMapping(Mapping):
+    """Mapping of partition keys to objects that are loaded when accessed.
+
+    Loaded partitions aren't kept. Iterating over `.items()` reads up to
+    `max_workers` partitions ahead concurrently, so only that many (plus
+    the current one) are held in memory at a time.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[Path], Any],
+        paths: dict[str, Path],
+        max_workers: int = 1,
+    ):
+        self._load = load
+        self._paths = paths
+        self._max_workers = max_workers
+
+    def __getitem__(self, key: str) -> Any:
+        return self._load(self._paths[key])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def items(self) -> Iterator[tuple[str, Any]]:
+        """Iterate over (partition key, value) tuples in partition key order"""
+        keys = iter(self._paths)
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            pending = deque(
+                (key, executor.submit(self._load, self._paths[key]))
+                for key in islice(keys, self._max_workers)
+            )
+            while pending:
+                key, future = pending.popleft()
+                for next_key in islice(keys, 1):
+                    pending.append(
+                        (next_key, executor.submit(self._load, self._paths[next_key])),
+                    )
+                yield key, future.result()
+
+
+# Input types for partitioned assets, to load partitions lazily as they are
+# accessed rather than all at once. Use with `dg.AssetIn(dagster_type=...)`
+LAZY_PARTITIONS_TYPE = dg.PythonObjectDagsterType(
+    Mapping,
+    name="LazyPartitions",
+    description="Mapping of partition keys to values that are loaded when accessed",
+)
+PARTITION_ITERATOR_TYPE = dg.PythonObjectDagsterType(
+    Iterator,
+    name="PartitionIterator",
+    description="Iterator of (partition key, value) tuples that are loaded as consumed",
+)
+
+
+def partition_collection_kind(dagster_type) -> str | None:
+    """How a partitioned input should be collected based on its type.
+
+    - `dict` loads all partitions up front, for dict or Mapping annotations
+    - `mapping` returns a `LazyPartitionMapping`, for `LAZY_PARTITIONS_TYPE`
+    - `iterator` returns an iterator of (partition key, value) tuples,
+      for `PARTITION_ITERATOR_TYPE` or Iterator annotations
+
+    Accepts either a Dagster type or a Python type annotation.
+    """
+    if dagster_type is LAZY_PARTITIONS_TYPE:
+        return "mapping"
+    if dagster_type is PARTITION_ITERATOR_TYPE:
+        return "iterator"
+
+    type_obj = getattr(dagster_type, "typing_type", dagster_type)
+    if isinstance(type_obj, dict):
+        return "dict"
 
-    except AttributeError:
-        pass
+    origin = getattr(type_obj, "__origin__", type_obj)
+    if origin in {dict, Mapping}:
+        return "dict"
+    if origin in {Iterator, Iterable}:
+        return "iterator"
 
-    return False
+    return None
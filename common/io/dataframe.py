@@ -0,0 +1,116 @@
+"""Shared base for IO managers that save Pandas dataframes"""
+
+from typing import Literal
+
+import numpy as np
+import pandas as pd
+from dagster import MetadataValue
+from pydantic import Field
+
+from .base import IOManagerBase
+
+
+class DataFrameIoManagerBase(IOManagerBase):
+    """Base for dataframe IO managers, with a configurable output metadata policy.
+
+    Summary statistics are stored as numeric metadata for each column,
+    so that Dagster can plot them across materializations.
+
+    - `full` summarizes every row and numeric column,
+      and adds markdown previews of the dataframe.
+    - `sampled` summarizes an evenly spaced sample of rows,
+      and only the first numeric columns, past the thresholds.
+    - `off` only records the shape of the dataframe.
+    """
+
+    metadata_policy: Literal["full", "sampled", "off"] = Field(
+        "sampled",
+        description="How much summary metadata to record for each output",
+    )
+    metadata_max_rows: int = Field(
+        100_000,
+        description="Rows to summarize before sampling",
+    )
+    metadata_max_columns: int = Field(
+        50,
+        description="Numeric columns to summarize before sampling",
+    )
+
+    def summary_metadata(
+        self,
+        obj: pd.DataFrame,
+        prefix: str,
+    ) -> dict[str, MetadataValue]:
+        """Summarize a dataframe as compact output metadata"""
+        metadata = {
+            "dagster/row_count": MetadataValue.int(len(obj)),
+            f"{prefix}.columns": MetadataValue.int(len(obj.columns)),
+        }
+
+        if self.metadata_policy == "off":
+            return metadata
+
+        numeric = obj.select_dtypes("number")
+        sampled = False
+
+        if self.metadata_policy == "sampled":
+            if len(numeric.columns) > self.metadata_max_columns:
+                numeric = numeric.iloc[:, : self.metadata_max_columns]
+                sampled = True
+            if len(numeric) > self.metadata_max_rows:
+                step = -(-len(numeric) // self.metadata_max_rows)
+                numeric = numeric.iloc[::step]
+                sampled = True
+
+        for column, stats in column_stats(numeric).items():
+            key = f"{prefix}.{column}"
+            metadata[f"{key}.nulls"] = MetadataValue.int(len(numeric) - stats["count"])
+            for name in ["min", "max", "mean"]:
+                if stats[name] is not None:
+                    metadata[f"{key}.{name}"] = MetadataValue.float(stats[name])
+        metadata[f"{prefix}.stats_sampled"] = MetadataValue.bool(sampled)
+
+        if self.metadata_policy == "full":
+            metadata |= dataframe_preview(obj, prefix)
+
+        return metadata
+
+
+def dataframe_preview(obj: pd.DataFrame, prefix: str) -> dict[str, MetadataValue]:
+    """Markdown tables of the start, end, and description of a dataframe"""
+    return {
+        f"{prefix}.head": MetadataValue.md(obj.head().to_markdown()),
+        f"{prefix}.tail": MetadataValue.md(obj.tail().to_markdown()),
+        f"{prefix}.describe": MetadataValue.md(obj.describe().to_markdown()),
+    }
+
+
+def column_stats(df: pd.DataFrame) -> dict[str, dict[str, float | int | None]]:
+    """Count, min, max, and mean of numeric columns, computed as one block.
+
+    Unlike `DataFrame.describe()` this skips percentiles,
+    which require sorting each column.
+    """
+    if df.empty:
+        return {}
+
+    values = df.to_numpy(dtype=np.float64, na_value=np.nan)
+    present = ~np.isnan(values)
+    count = present.sum(axis=0)
+    total = np.where(present, values, 0).sum(axis=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / count
+    minimum = np.where(present, values, np.inf).min(axis=0)
+    maximum = np.where(present, values, -np.inf).max(axis=0)
+
+    stats = {}
+    for i, column in enumerate(df.columns):
+        has_values = bool(count[i])
+        stats[str(column)] = {
+            "count": int(count[i]),
+            "min": float(minimum[i]) if has_values else None,
+            "max": float(maximum[i]) if has_values else None,
+            "mean": float(mean[i]) if has_values else None,
+        }
+    return stats
@@ -1,26 +1,232 @@
 """Load and save NetCDFs with Xarray to datastore"""
 
 from pathlib import Path
+from typing import TYPE_CHECKING
 
+import numpy as np
 import xarray as xr
-from dagster import InputContext, MetadataValue, OutputContext
+from dagster import InitResourceContext, InputContext, MetadataValue, OutputContext
+from pydantic import PrivateAttr
+from xarray.coding.times import encode_cf_datetime
 
+from common.config.encoding import NcEncoding
+
+from . import tags
 from .base import IOManagerBase
 
+if TYPE_CHECKING:
+    import netCDF4
+
+
+class AppendError(Exception):
+    """The dataset can't be appended in place to the existing NetCDF"""
+
 
 class XarrayNcIoManager(IOManagerBase):
-    """Load and save NetCDFs with Xarray"""
+    """Load and save NetCDFs with Xarray
+
+    If the asset sets `io.APPEND_DIM` in its metadata, the NetCDF is written
+    with that dimension as unlimited, and outputs for an existing file
+    are merged into it. Everything in the existing file from the start of the
+    new dataset along that dimension onwards is replaced by the new dataset.
+
+    Assets can set `io.NC_ENCODING` to a serialized `config.NcEncoding`
+    to control compression, chunking, and float precision.
+    """
+
+    _open_datasets: list[xr.Dataset] = PrivateAttr(default_factory=list)
 
     def dump_to_path(self, context: OutputContext, obj: xr.Dataset, path: Path) -> None:
         """Save Dataset to given path as a NetCDF"""
+        append_dim = context.definition_metadata.get(tags.APPEND_DIM)
+        encoding = self.encoding_policy(context)
+
+        if append_dim and path.exists():
+            write_mode, written = self.merge_into_path(obj, path, append_dim, encoding)
+        else:
+            write_mode, written = "full", obj
+            self.write_netcdf(obj, path, append_dim, encoding)
+
+        metadata = {
+            "nc.meta": MetadataValue.md(f"```\n{obj}\n```"),
+            "nc.write_mode": MetadataValue.text(write_mode),
+            "nc.bytes": MetadataValue.int(path.stat().st_size),
+        }
+        if written is not None:
+            metadata["nc.compression_ratio"] = MetadataValue.float(
+                written.nbytes / max(path.stat().st_size, 1),
+            )
+
+        context.add_output_metadata(metadata)
+
+    def updates_in_place(self, context: OutputContext) -> bool:
+        """Existing files are merged into when appending"""
+        return bool(context.definition_metadata.get(tags.APPEND_DIM))
+
+    def encoding_policy(self, context: OutputContext) -> NcEncoding | None:
+        """Encoding policy from the asset's `io.NC_ENCODING` metadata"""
+        encoding = context.definition_metadata.get(tags.NC_ENCODING)
+        if isinstance(encoding, MetadataValue):
+            encoding = encoding.value
+        if encoding is None:
+            return None
+        return NcEncoding.model_validate(encoding)
+
+    def write_netcdf(
+        self,
+        obj: xr.Dataset,
+        path: Path,
+        append_dim: str | None,
+        encoding: NcEncoding | None = None,
+    ):
+        """Write the full dataset to path"""
+        unlimited_dims = [append_dim] if append_dim else None
         try:
-            obj.to_netcdf(path)
+            obj.to_netcdf(
+                path,
+                unlimited_dims=unlimited_dims,
+                encoding=encoding.encoding_for(obj, unlimited_dims=unlimited_dims)
+                if encoding
+                else None,
+            )
         except (ValueError, TypeError) as e:
             raise TypeError(f"Failed to save {path} as NetCDF. {obj}") from e
 
-        context.add_output_metadata({"nc.meta": MetadataValue.md(f"```\n{obj}\n```")})
+    def merge_into_path(
+        self,
+        obj: xr.Dataset,
+        path: Path,
+        append_dim: str,
+        encoding: NcEncoding | None = None,
+    ) -> tuple[str, xr.Dataset | None]:
+        """Merge dataset into the existing NetCDF at path.
+
+        Returns how it was written, and the full dataset if it was rewritten.
+        An empty dataset leaves the existing file as it is.
+        """
+        if obj.sizes.get(append_dim, 0) == 0:
+            return "unchanged", None
+
+        with xr.open_dataset(path) as existing:
+            existing_values = existing[append_dim].values
+
+        start = np.searchsorted(existing_values, obj[append_dim].values.min())
+        if start == 0:
+            self.write_netcdf(obj, path, append_dim, encoding)
+            return "full", obj
+
+        try:
+            append_records(obj, path, append_dim, int(start))
+            return "append", None
+        except AppendError:
+            existing = xr.load_dataset(path)
+            merged = xr.concat(
+                [existing.isel({append_dim: slice(0, start)}), obj],
+                dim=append_dim,
+                data_vars="minimal",
+                coords="minimal",
+                compat="override",
+            )
+            merged.attrs = obj.attrs
+            self.write_netcdf(merged, path, append_dim, encoding)
+            return "rewrite", merged
 
     def load_from_path(self, context: InputContext, path: Path):
-        """Load a dataset from a given path"""
-        with xr.open_dataset(path) as ds:
-            return ds
+        """Load a dataset from a given path.
+
+        By default the dataset is loaded into memory and the file closed.
+        If the input sets `io.CHUNKS` (for example `{"time": 10_000}`),
+        a lazy Dask backed dataset is returned instead, and the file is kept
+        open until the step finishes.
+        """
+        chunks = context.definition_metadata.get(tags.CHUNKS)
+        if chunks is None:
+            return xr.load_dataset(path)
+
+        ds = xr.open_dataset(path, chunks=chunks)
+        self._open_datasets.append(ds)
+        return ds
+
+    def teardown_after_execution(self, context: InitResourceContext) -> None:
+        """Close any lazily loaded datasets"""
+        for ds in self._open_datasets:
+            ds.close()
+        self._open_datasets.clear()
+
+
+def append_records(obj: xr.Dataset, path: Path, dim: str, start: int) -> None:
+    """Write the records of obj into an existing NetCDF along an unlimited dimension.
+
+    Records in the file from `start` on are overwritten. Raises `AppendError`
+    before anything is written if the dataset doesn't line up with the file.
+    """
+    import netCDF4
+
+    with netCDF4.Dataset(path, "a") as nc:
+        check_appendable(obj, nc, path, dim, start)
+
+        records = {
+            name: record_values(obj.variables[name], nc.variables[name], path)
+            for name in obj.variables
+            if dim in obj.variables[name].dims
+        }
+
+        for name, values in records.items():
+            index = tuple(
+                slice(start, start + obj.sizes[dim]) if d == dim else slice(None)
+                for d in obj.variables[name].dims
+            )
+            nc.variables[name][index] = values
+
+
+def check_appendable(
+    obj: xr.Dataset,
+    nc: "netCDF4.Dataset",
+    path: Path,
+    dim: str,
+    start: int,
+) -> None:
+    """Raise `AppendError` if the dataset's records can't be written into the file"""
+    if dim not in nc.dimensions or not nc.dimensions[dim].isunlimited():
+        raise AppendError(f"{dim} is not an unlimited dimension in {path}")
+
+    if start + obj.sizes[dim] < nc.dimensions[dim].size:
+        raise AppendError("Dataset is shorter than the records it replaces")
+
+    for other_dim, size in obj.sizes.items():
+        if other_dim == dim:
+            continue
+        if other_dim not in nc.dimensions or nc.dimensions[other_dim].size != size:
+            raise AppendError(f"{other_dim} does not match {path}")
+        if other_dim in obj.variables and not np.array_equal(
+            obj[other_dim].values,
+            nc.variables[other_dim][:],
+        ):
+            raise AppendError(f"{other_dim} values do not match {path}")
+
+    file_vars = {name for name, var in nc.variables.items() if dim in var.dimensions}
+    obj_vars = {name for name, var in obj.variables.items() if dim in var.dims}
+    if file_vars != obj_vars:
+        raise AppendError(f"Variables along {dim} do not match {path}")
+
+
+def record_values(
+    var: xr.Variable,
+    nc_var: "netCDF4.Variable",
+    path: Path,
+) -> np.ndarray:
+    """Values of a variable encoded for the matching NetCDF variable"""
+    name = nc_var.name
+    if tuple(var.dims) != nc_var.dimensions:
+        raise AppendError(f"{name} dimensions do not match {path}")
+
+    values = var.values
+    if values.dtype.kind == "M":
+        values, _, _ = encode_cf_datetime(
+            values,
+            nc_var.units,
+            getattr(nc_var, "calendar", "standard"),
+        )
+    elif values.dtype.kind not in "biuf":
+        raise AppendError(f"{name} can't be appended in place")
+    return values
@@ -0,0 +1,72 @@
+"""Load and save Parquet files with Pandas to the datastore"""
+
+from pathlib import Path
+
+import pandas as pd
+from dagster import InputContext, MetadataValue, OutputContext
+from pydantic import Field
+
+from . import tags
+from .csv_io import write_csv
+from .dataframe import DataFrameIoManagerBase
+
+
+class PandasParquetIoManager(DataFrameIoManagerBase):
+    """Load and save Parquet files with Pandas
+
+    Unlike CSVs, Parquet keeps column dtypes, so datetimes and floats
+    don't need to be re-inferred downstream.
+
+    Inputs can set `io.COLUMNS` to only load specific columns,
+    and outputs can set `io.CSV_EXPORT_PATH` to also write
+    an ERDDAP compatible CSV alongside the Parquet file.
+    """
+
+    compression: str = Field(
+        "zstd",
+        description="Parquet compression codec",
+    )
+
+    def dump_to_path(
+        self,
+        context: OutputContext,
+        obj: pd.DataFrame,
+        path: Path,
+    ) -> None:
+        """Save dataframe to a given path as Parquet, and optionally a CSV"""
+        obj.to_parquet(path, index=False, compression=self.compression)
+
+        metadata = self.summary_metadata(obj, "parquet")
+
+        if csv_path := self.csv_export_path(context):
+            csv_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.atomic_path(
+                context,
+                csv_path,
+                checksum_key=f"{tags.CSV_EXPORT_PATH}.{tags.CHECKSUM}",
+            ) as temp_path:
+                write_csv(obj, temp_path)
+            metadata[tags.CSV_EXPORT_PATH] = MetadataValue.path(str(csv_path))
+
+        context.add_output_metadata(metadata)
+
+    def csv_export_path(self, context: OutputContext) -> Path | None:
+        """Path to export a CSV copy of the output to, if requested"""
+        try:
+            export_template: str = context.definition_metadata[tags.CSV_EXPORT_PATH]
+        except KeyError:
+            return None
+
+        partition_key = context.partition_key if context.has_partition_key else None
+        formatting_context = self.get_path_formatting_context(
+            context,
+            partition_key=partition_key,
+        )
+        return self.datastore.dataset_path() / export_template.format_map(
+            formatting_context,
+        )
+
+    def load_from_path(self, context: InputContext, path: Path) -> pd.DataFrame:
+        """Load a dataframe from a given Parquet path"""
+        columns = context.definition_metadata.get(tags.COLUMNS)
+        return pd.read_parquet(path, columns=columns)
@@ -7,3 +7,10 @@ S3_OUTPUT_PATH = "s3_path"
 S3_DESIRED_PATH = "s3_desired_path"
 S3_URL = "s3_url"
 S3_PUBLIC = "s3_public"
+APPEND_DIM = "append_dim"
+INCREMENTAL_TARGET_PATH = "incremental_target_path"
+COLUMNS = "columns"
+CSV_EXPORT_PATH = "csv_export_path"
+CHUNKS = "chunks"
+NC_ENCODING = "nc_encoding"
+CHECKSUM = "checksum"
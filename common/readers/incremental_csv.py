@@ -0,0 +1,302 @@
+"""Incrementally read CSVs in S3 that are appended to during the day"""
+
+import hashlib
+import time
+import uuid
+from datetime import timedelta
+from io import BytesIO
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated
+
+import pandas as pd
+from pydantic import BaseModel, Field
+
+from .pandas_csv import PandasCSVReader
+
+if TYPE_CHECKING:
+    import s3fs
+
+# Bytes before the read offset that must match, along with the header,
+# for an object to be treated as appended to, rather than rewritten
+FINGERPRINT_BYTES = 1024
+# ETags to remember for each object
+MAX_ETAGS = 100
+
+
+class ReadState(BaseModel):
+    """How much of an S3 object has been read"""
+
+    etags: Annotated[
+        list[str],
+        Field(description="ETags the object has had, most recent last"),
+    ]
+    offset: Annotated[
+        int,
+        Field(description="Bytes of complete lines that have been parsed"),
+    ]
+    rows: Annotated[int, Field(description="Rows parsed from complete lines")]
+    header: Annotated[
+        str,
+        Field(description="Lines up to and including the header row"),
+    ]
+    fingerprint: Annotated[
+        str,
+        Field(description="Hash of the bytes directly before the offset"),
+    ]
+
+
+class IncrementalCSVReader:
+    """Read CSVs in S3 that are appended to, only fetching the new bytes.
+
+    For each key and reader settings, the ETag history, byte offset of the
+    last complete line, a fingerprint of the bytes before it, and the frame
+    parsed so far are kept in `state_dir`. When an object's ETag changes,
+    its header and the bytes before the offset are checked against the
+    state, and if they match only the bytes after it are parsed and appended.
+    Objects that were rewritten are read in full. State that hasn't been
+    used for `max_age` is evicted.
+    """
+
+    def __init__(
+        self,
+        reader: PandasCSVReader,
+        fs: "s3fs.S3FileSystem",
+        state_dir: Path,
+        batch_size: int | None = None,
+        max_age: timedelta = timedelta(days=7),
+    ):
+        self.reader = reader
+        self.fs = fs
+        self.state_dir = state_dir
+        self.batch_size = batch_size
+        self.max_age = max_age
+        self.stats = {"unchanged": 0, "appended": 0, "full": 0}
+
+        self.settings_digest = reader.settings_digest()
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+
+    def read(self, infos: dict[str, dict]) -> dict[str, pd.DataFrame]:
+        """Read objects from their S3 info, from `fs.info()` or `fs.glob(detail=True)`"""
+        frames = {}
+        full, appended = [], []
+
+        states = {key: self.load_state(key) for key in infos}
+
+        for key, info in infos.items():
+            state = states[key]
+            etag = info.get("ETag")
+
+            if state is None or etag is None:
+                full.append(key)
+            elif state.etags and state.etags[-1] == etag:
+                frames[key] = self.load_frame(key)
+                self.stats["unchanged"] += 1
+            elif etag in state.etags or info["size"] < state.offset:
+                # The object went back to an earlier version, or shrank
+                full.append(key)
+            else:
+                appended.append(key)
+
+        if appended:
+            full.extend(self.read_appended(appended, states, infos, frames))
+
+        if full:
+            contents = self.fs.cat(full, batch_size=self.batch_size, on_error="raise")
+            for key in full:
+                frames[key] = self.read_full(key, infos[key], contents[key])
+                self.stats["full"] += 1
+
+        self.evict()
+
+        return {key: frames[key] for key in infos}
+
+    def read_appended(
+        self,
+        keys: list[str],
+        states: dict[str, ReadState],
+        infos: dict[str, dict],
+        frames: dict[str, pd.DataFrame],
+    ) -> list[str]:
+        """Fetch and append the new bytes of objects, adding them to `frames`.
+
+        Returns the keys that were rewritten rather than appended to.
+        """
+        starts = [max(states[key].offset - FINGERPRINT_BYTES, 0) for key in keys]
+        header_ends = [len(states[key].header.encode()) for key in keys]
+
+        # Fetch each object's header and the bytes from before its offset
+        chunks = self.fs.cat_ranges(
+            keys + keys,
+            [0] * len(keys) + starts,
+            header_ends + [infos[key]["size"] for key in keys],
+            batch_size=self.batch_size,
+        )
+        headers, tails = chunks[: len(keys)], chunks[len(keys) :]
+
+        rewritten = []
+        for key, start, header, chunk in zip(keys, starts, headers, tails, strict=True):
+            state = states[key]
+            before = state.offset - start
+            if (
+                isinstance(header, Exception)
+                or isinstance(chunk, Exception)
+                or header != state.header.encode()
+                or fingerprint(chunk[:before]) != state.fingerprint
+            ):
+                rewritten.append(key)
+                continue
+
+            frames[key] = self.append(
+                key,
+                state,
+                infos[key],
+                chunk[:before],
+                chunk[before:],
+            )
+            self.stats["appended"] += 1
+
+        return rewritten
+
+    def read_full(self, key: str, info: dict, content: bytes) -> pd.DataFrame:
+        """Parse a whole object, and save its state"""
+        complete, partial = split_complete_lines(content)
+        header = header_lines(content, self.reader.comment)
+
+        df = self.reader.read_df(BytesIO(complete or header))
+        self.save(
+            key,
+            df,
+            ReadState(
+                etags=[info["ETag"]] if info.get("ETag") else [],
+                offset=len(complete),
+                rows=len(df),
+                header=header.decode(),
+                fingerprint=fingerprint(complete[-FINGERPRINT_BYTES:]),
+            ),
+        )
+        return self.with_partial(df, header, partial)
+
+    def append(
+        self,
+        key: str,
+        state: ReadState,
+        info: dict,
+        previous_bytes: bytes,
+        new_bytes: bytes,
+    ) -> pd.DataFrame:
+        """Parse the bytes added to an object, append them, and save its state.
+
+        `previous_bytes` are the bytes directly before the old offset.
+        """
+        complete, partial = split_complete_lines(new_bytes)
+        header = state.header.encode()
+
+        df = self.load_frame(key)
+        if complete:
+            new_df = self.reader.read_df(BytesIO(header + complete))
+            df = pd.concat([df, new_df], ignore_index=True)
+
+        self.save(
+            key,
+            df,
+            ReadState(
+                etags=[*state.etags, info["ETag"]][-MAX_ETAGS:],
+                offset=state.offset + len(complete),
+                rows=len(df),
+                header=state.header,
+                fingerprint=fingerprint(
+                    (previous_bytes + complete)[-FINGERPRINT_BYTES:],
+                ),
+            ),
+        )
+        return self.with_partial(df, header, partial)
+
+    def with_partial(
+        self,
+        df: pd.DataFrame,
+        header: bytes,
+        partial: bytes,
+    ) -> pd.DataFrame:
+        """Add a trailing line without a newline, which isn't kept in the state.
+
+        It may still be being written, so it's read again next time.
+        """
+        if not partial.strip():
+            return df
+        return pd.concat(
+            [df, self.reader.read_df(BytesIO(header + partial))],
+            ignore_index=True,
+        )
+
+    def paths(self, key: str) -> tuple[Path, Path]:
+        """State and frame paths for a key, with the current reader settings"""
+        digest = hashlib.sha256(f"{self.settings_digest}:{key}".encode()).hexdigest()
+        return self.state_dir / f"{digest}.json", self.state_dir / f"{digest}.pkl"
+
+    def load_state(self, key: str) -> ReadState | None:
+        """Load the read state for a key, if there is one and its frame exists"""
+        state_path, frame_path = self.paths(key)
+        if not (state_path.exists() and frame_path.exists()):
+            return None
+        return ReadState.model_validate_json(state_path.read_text())
+
+    def load_frame(self, key: str) -> pd.DataFrame:
+        """Load the frame parsed so far for a key"""
+        state_path, frame_path = self.paths(key)
+        df = pd.read_pickle(frame_path)  # noqa: S301
+
+        # Track use by modification time, for eviction
+        state_path.touch()
+        frame_path.touch()
+        return df
+
+    def save(self, key: str, df: pd.DataFrame, state: ReadState) -> None:
+        """Save the frame and then the state, so the state never runs ahead"""
+        state_path, frame_path = self.paths(key)
+
+        # Unique temporary names, so concurrent runs never write the same file
+        temp_frame_path = temp_path(frame_path)
+        df.to_pickle(temp_frame_path)
+        temp_frame_path.replace(frame_path)
+
+        temp_state_path = temp_path(state_path)
+        temp_state_path.write_text(state.model_dump_json())
+        temp_state_path.replace(state_path)
+
+    def evict(self) -> None:
+        """Remove state and frames that haven't been used for `max_age`"""
+        cutoff = time.time() - self.max_age.total_seconds()
+        for path in self.state_dir.iterdir():
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def temp_path(path: Path) -> Path:
+    """Unique path to write to before renaming to `path`"""
+    return path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+
+
+def fingerprint(content: bytes) -> str:
+    """Hash of some bytes"""
+    return hashlib.sha256(content).hexdigest()
+
+
+def split_complete_lines(content: bytes) -> tuple[bytes, bytes]:
+    """Split content into complete lines, and any trailing partial line"""
+    end = content.rfind(b"\n") + 1
+    return content[:end], content[end:]
+
+
+def header_lines(content: bytes, comment: str | None = None) -> bytes:
+    """Lines up to and including the header row, skipping comment lines"""
+    offset = 0
+    for line in content.splitlines(keepends=True):
+        offset += len(line)
+        if line.strip() and not (
+            comment and line.lstrip().startswith(comment.encode())
+        ):
+            break
+    return content[:offset]
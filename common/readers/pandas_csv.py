@@ -1,7 +1,8 @@
-from typing import Annotated
+import hashlib
+from typing import Annotated, Literal, Self
 
 import pandas as pd
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
 
 
 class PandasCSVReader(BaseModel):
@@ -20,10 +21,138 @@ class PandasCSVReader(BaseModel):
     # skiprows
     # sep
     # on_bad_lines
-    # usecols
+
+    engine: Annotated[
+        Literal["c", "python", "pyarrow"] | None,
+        Field(
+            description=(
+                "Parser engine. pyarrow is multithreaded, "
+                "but needs an explicit `sep` and doesn't support `comment`"
+            ),
+        ),
+    ] = None
+    usecols: Annotated[
+        list[str] | None,
+        Field(description="Only parse these columns"),
+    ] = None
+    dtype: Annotated[
+        dict[str, str] | None,
+        Field(description="Data types for columns, by column name"),
+    ] = None
+    parse_dates: Annotated[
+        list[str] | None,
+        Field(description="Columns to parse as datetimes while reading"),
+    ] = None
+    date_format: Annotated[
+        str | None,
+        Field(description="strftime format of the `parse_dates` columns"),
+    ] = None
+    infer_schema: Annotated[
+        bool,
+        Field(
+            description=(
+                "Infer numeric column types from the first file read, "
+                "and use them for later files"
+            ),
+        ),
+    ] = False
+
+    # Numeric dtypes inferred from the first file, when `infer_schema` is set
+    _schema: dict[str, str] | None = PrivateAttr(default=None)
+    # Columns to read when `usecols` isn't set, see `with_columns`
+    _columns: frozenset[str] | None = PrivateAttr(default=None)
+
+    @model_validator(mode="after")
+    def check_engine_options(self) -> Self:
+        """pyarrow can't sniff delimiters or skip comments"""
+        if self.engine == "pyarrow":
+            if self.comment is not None:
+                raise ValueError("The pyarrow engine does not support `comment`")
+            if self.sep is None:
+                raise ValueError("The pyarrow engine needs an explicit `sep`")
+        return self
+
+    def reader_kwargs(self) -> dict:
+        """Keyword arguments for `pd.read_csv`"""
+        # Keep the original arguments as they were,
+        # and only pass the newer ones when they are set
+        kwargs = {
+            "sep": self.sep,
+            "comment": self.comment,
+            "na_values": self.na_values,
+        }
+        for name in ["engine", "usecols", "parse_dates", "date_format"]:
+            value = getattr(self, name)
+            if value is not None:
+                kwargs[name] = value
+
+        if self.usecols is None and self._columns is not None:
+            # Callable so that columns a file doesn't have are ignored
+            kwargs["usecols"] = self._columns.__contains__
+
+        dtype = (self._schema or {}) | (self.dtype or {})
+        if dtype:
+            kwargs["dtype"] = dtype
+
+        return kwargs
+
+    def with_columns(self, columns: set[str]) -> "PandasCSVReader":
+        """Copy of the reader that only parses the given columns, if files have them"""
+        reader = self.model_copy()
+        reader._columns = frozenset(columns)
+        return reader
+
+    def settings_digest(self) -> str:
+        """Hash of the settings that change how files are parsed"""
+        columns = sorted(self._columns) if self._columns is not None else None
+        settings = f"{self.model_dump_json()}:{columns}"
+        return hashlib.sha256(settings.encode()).hexdigest()
 
     def read_df(self, file_path) -> pd.DataFrame:
         """Read a CSV file from S3 into a Pandas DataFrame"""
-        reader_kwargs = self.model_dump()
+        reader_kwargs = self.reader_kwargs()
+
+        if self._schema is None:
+            df = pd.read_csv(file_path, **reader_kwargs)
+        else:
+            # File objects are read again from where they started,
+            # and paths are reopened
+            start = None
+            if hasattr(file_path, "read") and file_path.seekable():
+                start = file_path.tell()
+
+            try:
+                df = pd.read_csv(file_path, **reader_kwargs)
+            except (ValueError, TypeError):
+                # The file doesn't fit the inferred schema, so infer it again,
+                # unless it's a stream that can't be read again
+                if hasattr(file_path, "read") and start is None:
+                    raise
+                if start is not None:
+                    file_path.seek(start)
+                self._schema = None
+                df = pd.read_csv(file_path, **self.reader_kwargs())
+
+        if self.infer_schema and self._schema is None:
+            self._schema = infer_numeric_schema(df, exclude=self.dtype)
 
-        return pd.read_csv(file_path, **reader_kwargs)
+        return df
+
+
+def infer_numeric_schema(
+    df: pd.DataFrame,
+    exclude: dict[str, str] | None = None,
+) -> dict[str, str]:
+    """Numeric column dtypes of a dataframe.
+
+    Integers are widened to floats, so later files with missing values still fit.
+    """
+    schema = {}
+    for column, dtype in df.dtypes.items():
+        if exclude and column in exclude:
+            continue
+        if pd.api.types.is_bool_dtype(dtype):
+            continue
+        if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_float_dtype(dtype):
+            schema[column] = "float64"
+    return schema
@@ -0,0 +1,83 @@
+"""Local disk cache for downloaded objects"""
+
+import hashlib
+import uuid
+from pathlib import Path
+
+
+class ObjectCache:
+    """Content addressed disk cache for object bytes.
+
+    Objects are keyed by their key and version (such as an S3 ETag), so a
+    changed object is never served from the cache. When the cache grows
+    past `max_bytes`, the least recently used objects are evicted.
+    """
+
+    def __init__(self, path: Path, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def object_path(self, key: str, version: str) -> Path:
+        """Path an object version is cached at"""
+        digest = hashlib.sha256(f"{key}@{version}".encode()).hexdigest()
+        return self.path / digest[:2] / digest
+
+    def get(self, key: str, version: str | None) -> bytes | None:
+        """Cached bytes for an object version, if there are any"""
+        if version is None:
+            self.misses += 1
+            return None
+
+        path = self.object_path(key, version)
+        try:
+            content = path.read_bytes()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        # Track use by modification time, as access times often aren't updated
+        path.touch()
+        self.hits += 1
+        return content
+
+    def put(self, key: str, version: str | None, content: bytes) -> None:
+        """Cache the bytes of an object version"""
+        if version is None:
+            return
+
+        path = self.object_path(key, version)
+        path.parent.mkdir(exist_ok=True)
+
+        # Write and rename so concurrent readers never see a partial object
+        temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+        temp_path.write_bytes(content)
+        temp_path.replace(path)
+
+    def evict(self) -> None:
+        """Remove the least recently used objects until the cache fits in `max_bytes`"""
+        entries = []
+        total = 0
+        for path in self.path.glob("*/*"):
+            if path.name.startswith("."):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def stats(self) -> dict[str, int]:
+        """Hit and miss counts"""
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,51 @@
+import numpy as np
+import xarray as xr
+
+from common.config import NcEncoding
+
+
+def test_encoding_for_compresses_and_chunks_numeric_variables():
+    """Numeric variables get compression and time chunks"""
+    ds = xr.Dataset(
+        {
+            "temp": (("time", "depth"), np.zeros((10, 3))),
+            "station_name": ((), "EW01"),
+        },
+    )
+
+    encoding = NcEncoding(time_chunk=4).encoding_for(ds)
+
+    assert encoding == {
+        "temp": {
+            "compression": "zlib",
+            "complevel": 4,
+            "shuffle": True,
+            "chunksizes": (4, 3),
+        },
+    }
+
+
+def test_encoding_for_unlimited_time_and_float32():
+    """Unlimited time chunks aren't limited by size, and floats can be downcast"""
+    ds = xr.Dataset({"temp": (("time",), np.zeros(10))})
+
+    encoding = NcEncoding(
+        compression=None,
+        time_chunk=100,
+        float32=True,
+    ).encoding_for(ds, unlimited_dims=["time"])
+
+    assert encoding["temp"]["chunksizes"] == (100,)
+    assert encoding["temp"]["dtype"] == "float32"
+    assert np.isnan(encoding["temp"]["_FillValue"])
+    assert "compression" not in encoding["temp"]
+
+
+def test_encoding_for_empty_time_has_valid_chunks(tmp_path):
+    """Empty dimensions still get chunks of at least one element"""
+    ds = xr.Dataset({"temp": (("time", "depth"), np.zeros((0, 3)))})
+
+    encoding = NcEncoding(time_chunk=100).encoding_for(ds)
+    ds.to_netcdf(tmp_path / "empty.nc", encoding=encoding)
+
+    assert encoding["temp"]["chunksizes"] == (1, 3)
@@ -0,0 +1,311 @@
+import pandas as pd
+import pytest
+
+from common.config.mappings import (
+    ConverterPlan,
+    DropColumns,
+    ProfileConverter,
+    RenamePlan,
+    SplitOperator,
+    VarMap,
+    converter_source_columns,
+)
+
+
+def test_split_source_columns():
+    split = SplitOperator(
+        sep=" ",
+        source_variable="wind",
+        output_variables={0: "wind_speed", 1: "wind_direction"},
+    )
+
+    assert split.source_columns({"time", "wind_speed"}) == {"time", "wind"}
+    assert split.source_columns({"time"}) == {"time"}
+
+
+def test_converter_source_columns_through_profile():
+    converters = [
+        DropColumns(column_names=["battery"]),
+        ProfileConverter(
+            profile_data=[
+                {"depth": 1, "mappings": {"temp_1": "temp", "sal_1": "sal"}},
+                {"depth": 2, "mappings": {"temp_2": "temp", "sal_2": "sal"}},
+            ],
+        ),
+    ]
+
+    assert converter_source_columns(converters, {"time", "temp", "depth"}) == {
+        "time",
+        "temp_1",
+        "temp_2",
+    }
+
+
+def test_drop_columns_raises_on_missing_columns():
+    """Typos in configured column names aren't silently ignored"""
+    df = pd.DataFrame({"time": [1], "wind": [2]})
+
+    with pytest.raises(KeyError, match="battery"):
+        DropColumns(column_names=["battery", "wind"]).convert(df)
+
+
+def converter_chain():
+    return [
+        DropColumns(column_names=["battery"]),
+        SplitOperator(
+            sep=" ",
+            source_variable="wind",
+            output_variables={0: "wind_speed", 1: "wind_direction"},
+        ),
+        DropColumns(column_names=["wind_direction", "status"]),
+        ProfileConverter(
+            profile_data=[
+                {"depth": 1, "mappings": {"temp_1": "temp"}},
+                {"depth": 2, "mappings": {"temp_2": "temp"}},
+            ],
+        ),
+    ]
+
+
+def source_df():
+    return pd.DataFrame(
+        {
+            "time": ["2025-01-01T00:00", "2025-01-01T00:10"],
+            "battery": [12.1, 12.0],
+            "status": ["ok", "ok"],
+            "wind": ["1.5 270", "2.5 180"],
+            "temp_1": [10.0, 10.5],
+            "temp_2": [9.0, 9.5],
+        },
+    )
+
+
+def test_converter_plan_matches_converters():
+    df = source_df()
+    expected = df
+    for converter in converter_chain():
+        expected = converter.convert(expected)
+
+    result = ConverterPlan(converter_chain()).run(df)
+
+    pd.testing.assert_frame_equal(result, expected)
+    pd.testing.assert_frame_equal(df, source_df())
+
+
+def test_converter_plan_drops_early():
+    plan = ConverterPlan(converter_chain())
+
+    assert plan.drop_columns == ["battery", "status"]
+    assert [step.converter_type for step in plan.steps] == ["split", "drop", "profile"]
+    assert plan.steps[1].column_names == ["wind_direction"]
+
+
+def test_converter_plan_split_does_not_modify_input():
+    df = source_df()
+
+    result = ConverterPlan([converter_chain()[1]]).run(df)
+
+    assert "wind" in df.columns
+    assert list(result["wind_speed"]) == [1.5, 2.5]
+
+
+def test_converter_plan_after_concat():
+    frames = [source_df(), source_df()]
+    per_file = pd.concat([ConverterPlan(converter_chain()).run(df) for df in frames])
+
+    concatenated = ConverterPlan(converter_chain()).run(pd.concat(frames))
+
+    sort = ["time", "depth"]
+    pd.testing.assert_frame_equal(
+        concatenated.sort_values(sort, kind="stable").reset_index(drop=True),
+        per_file.sort_values(sort, kind="stable").reset_index(drop=True),
+    )
+
+
+def test_split_fast_path_matches_str_split():
+    df = pd.DataFrame({"wind": ["1.5 270 3", "2.5 180 4", "0 0 0"]})
+    split = SplitOperator(
+        sep=" ",
+        source_variable="wind",
+        output_variables={0: "wind_speed", 2: "gust"},
+    )
+    expanded = df["wind"].str.split(" ", expand=True)
+
+    result = split.convert(df)
+
+    assert split.is_fast_path()
+    assert list(result.columns) == ["wind_speed", "gust"]
+    pd.testing.assert_series_equal(
+        result["wind_speed"],
+        expanded[0].astype(float),
+        check_names=False,
+    )
+    pd.testing.assert_series_equal(
+        result["gust"],
+        expanded[2].astype(float),
+        check_names=False,
+    )
+
+
+def test_split_fast_path_malformed_rows_are_nan():
+    df = pd.DataFrame({"wind": ["1.5 270", "bad", None, "2.5 x"]})
+    split = SplitOperator(
+        sep=" ",
+        source_variable="wind",
+        output_variables={0: "wind_speed", 1: "wind_direction"},
+    )
+
+    result = split.convert(df)
+
+    assert result["wind_speed"].tolist()[0] == 1.5
+    assert result["wind_speed"].isna().tolist() == [False, True, True, False]
+    assert result["wind_direction"].isna().tolist() == [False, True, True, True]
+
+
+@pytest.mark.parametrize("dtype", ["str", "string", object])
+def test_split_fast_path_string_dtypes_with_missing_values(dtype):
+    df = pd.DataFrame({"wind": pd.Series(["1.5 270", None, "12.25 90"], dtype=dtype)})
+    split = SplitOperator(
+        sep=" ",
+        source_variable="wind",
+        output_variables={0: "wind_speed", 1: "wind_direction"},
+    )
+
+    result = split.convert(df)
+
+    assert result["wind_speed"].to_numpy()[[0, 2]].tolist() == [1.5, 12.25]
+    assert result["wind_direction"].to_numpy()[[0, 2]].tolist() == [270.0, 90.0]
+    assert result[["wind_speed", "wind_direction"]].iloc[1].isna().all()
+
+
+def test_split_regex_separator_uses_str_split():
+    split = SplitOperator(
+        sep="|+",
+        source_variable="wind",
+        output_variables={0: "wind_speed"},
+    )
+
+    assert not split.is_fast_path()
+
+
+def adcp_converter(n_bins=3):
+    return ProfileConverter(
+        profile_data=[
+            {
+                "depth": 2 * (n + 1),
+                "mappings": {f"speed_{n}": "speed", f"dir_{n}": "direction"},
+            }
+            for n in range(n_bins)
+        ],
+    )
+
+
+def adcp_df(n_bins=3):
+    data = {"time": ["2025-01-01T00:00", "2025-01-01T00:10"], "battery": [12, 11]}
+    for n in range(n_bins):
+        data[f"speed_{n}"] = [0.1 * n, 0.2 * n]
+        data[f"dir_{n}"] = [10 * n, 20 * n]
+    return pd.DataFrame(data, index=[5, 6])
+
+
+def test_profile_reshape_matches_concat():
+    converter = adcp_converter()
+    df = adcp_df()
+    non_profile_vars = df.columns.difference(list(converter.input_columns())).tolist()
+
+    result = converter.convert(df)
+
+    assert converter.is_uniform(df, non_profile_vars)
+    pd.testing.assert_frame_equal(
+        result,
+        converter.apply_concat(df, non_profile_vars),
+    )
+    assert result["depth"].tolist() == [2.0, 2.0, 4.0, 4.0, 6.0, 6.0]
+
+
+def test_profile_differing_mappings_use_concat():
+    converter = ProfileConverter(
+        profile_data=[
+            {"depth": 1, "mappings": {"temp_1": "temp", "sal_1": "sal"}},
+            {"depth": 2, "mappings": {"temp_2": "temp"}},
+        ],
+    )
+    df = pd.DataFrame(
+        {
+            "time": ["2025-01-01T00:00"],
+            "temp_1": [10.0],
+            "sal_1": [30.0],
+            "temp_2": [9.0],
+        },
+    )
+
+    result = converter.convert(df)
+
+    assert not converter.is_uniform(df, ["time"])
+    assert result["sal"].isna().tolist() == [False, True]
+
+
+def test_rename_plan_follows_chained_mappings():
+    plan = RenamePlan(
+        [
+            VarMap(source="a", output="b"),
+            VarMap(source="b", output="c"),
+            VarMap(source="d", output="e"),
+        ],
+    )
+
+    assert plan.final_names == {"a": "c", "b": "c", "d": "e"}
+    assert plan.collisions == {"c": ["a", "b"]}
+    assert plan.missing_sources(["a", "time"]) == ["d"]
+
+
+def test_rename_plan_without_collisions():
+    plan = RenamePlan([VarMap(source="Temp_C", output="temp")])
+    df = pd.DataFrame({"time": [1, 2], "Temp_C": [9.0, 2.0]})
+
+    result = plan.apply(df)
+
+    assert plan.collisions == {}
+    assert list(result.columns) == ["time", "temp"]
+    assert list(df.columns) == ["time", "Temp_C"]
+
+
+def test_rename_plan_coalesces_collisions():
+    plan = RenamePlan(
+        [
+            VarMap(source="Temp_C", output="temp"),
+            VarMap(source="temp_backup", output="temp"),
+        ],
+    )
+    df = pd.DataFrame(
+        {
+            "time": [1, 2, 3, 4],
+            "temp_backup": [7.0, 7.0, 3.0, None],
+            "Temp_C": [9.0, 2.0, None, None],
+            "temp": [1.0, None, None, None],
+        },
+    )
+
+    result = plan.apply(df)
+
+    assert plan.collisions_in(df.columns) == {
+        "temp": ["temp_backup", "Temp_C", "temp"],
+    }
+    assert list(result.columns) == ["time", "temp"]
+    assert result["temp"].tolist()[:3] == [1.0, 2.0, 3.0]
+    assert pd.isna(result["temp"].iloc[3])
+
+
+def test_converter_plan_only_ignores_columns_that_were_not_read():
+    df = source_df().drop(columns=["battery"])
+
+    with pytest.raises(KeyError, match="battery"):
+        ConverterPlan(converter_chain()).run(df)
+
+    read_columns = set(df.columns)
+    result = ConverterPlan(converter_chain(), read_columns).run(df)
+    assert "status" not in result.columns
+
+    # Columns that should have been read still have to be there
+    with pytest.raises(KeyError, match="battery"):
+        ConverterPlan(converter_chain(), read_columns | {"battery"}).run(df)
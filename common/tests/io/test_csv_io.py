@@ -1,9 +1,17 @@
+from collections.abc import Iterator, Mapping
 from pathlib import Path
 
 import dagster as dg
 import pandas as pd
 
 from common.io import tags as io
+from common.io.base import (
+    LAZY_PARTITIONS_TYPE,
+    PARTITION_ITERATOR_TYPE,
+    LazyPartitionMapping,
+    file_checksum,
+    partition_collection_kind,
+)
 from common.io.csv_io import PandasCsvIoManager
 from common.io.datastore import Datastore
 
@@ -133,3 +141,111 @@ def test_csv_io_load_unpartitioned_input(tmp_path: Path):
 #     # Verify that the written and read DataFrames are the same
 #     for key, df_read in dfs_read.items():
 #         pd.testing.assert_frame_equal(df_to_write, df_read)
+
+
+def test_csv_io_summary_metadata(tmp_path: Path):
+    """Summary statistics are stored as compact metadata"""
+    datastore = Datastore(path_stub="test_stub", test_path=str(tmp_path))
+    csv_io = PandasCsvIoManager(datastore=datastore, metadata_policy="full")
+
+    df = pd.DataFrame({"a": [1.0, None, 3.0], "b": ["x", "y", "z"]})
+
+    metadata = csv_io.summary_metadata(df, "csv")
+
+    assert metadata["dagster/row_count"].value == 3
+    assert metadata["csv.columns"].value == 2
+    assert metadata["csv.a.nulls"].value == 1
+    assert metadata["csv.a.min"].value == 1.0
+    assert metadata["csv.a.max"].value == 3.0
+    assert metadata["csv.a.mean"].value == 2.0
+    assert "csv.b.nulls" not in metadata
+    assert "csv.describe" in metadata
+
+
+def test_csv_io_summary_metadata_sampled_and_off(tmp_path: Path):
+    """Large dataframes are sampled, and summaries can be turned off"""
+    datastore = Datastore(path_stub="test_stub", test_path=str(tmp_path))
+    df = pd.DataFrame({"a": range(10), "b": range(10), "c": range(10)})
+
+    sampled_io = PandasCsvIoManager(
+        datastore=datastore,
+        metadata_policy="sampled",
+        metadata_max_rows=5,
+        metadata_max_columns=2,
+    )
+    metadata = sampled_io.summary_metadata(df, "csv")
+    assert metadata["csv.stats_sampled"].value is True
+    assert {"csv.a.max", "csv.b.max"} <= set(metadata)
+    assert "csv.c.max" not in metadata
+    assert metadata["csv.a.max"].value == 8.0
+    assert "csv.head" not in metadata
+
+    off_io = PandasCsvIoManager(datastore=datastore, metadata_policy="off")
+    metadata = off_io.summary_metadata(df, "csv")
+    assert set(metadata) == {"dagster/row_count", "csv.columns"}
+
+
+def test_csv_io_writes_atomically(tmp_path: Path):
+    """Outputs are written to scratch and renamed into place"""
+    datastore = Datastore(path_stub="test_stub", test_path=str(tmp_path))
+    csv_io = PandasCsvIoManager(datastore=datastore)
+
+    output_context = dg.build_output_context(
+        definition_metadata={io.DESIRED_PATH: "test_output.csv"},
+    )
+    csv_io.handle_output(output_context, pd.DataFrame({"a": [1, 2, 3]}))
+
+    assert [p.name for p in (tmp_path / "test_stub").iterdir()] == [
+        "test_output.csv",
+    ]
+    assert file_checksum(tmp_path / "test_stub" / "test_output.csv").startswith(
+        "sha256:",
+    )
+
+
+def test_partition_collection_kind():
+    """Mapping annotations load eagerly, lazy loading needs the explicit Dagster types"""
+    assert partition_collection_kind(dict[str, pd.DataFrame]) == "dict"
+    assert partition_collection_kind(Mapping[str, pd.DataFrame]) == "dict"
+    assert partition_collection_kind(LAZY_PARTITIONS_TYPE) == "mapping"
+    assert partition_collection_kind(PARTITION_ITERATOR_TYPE) == "iterator"
+    assert partition_collection_kind(Iterator[tuple[str, pd.DataFrame]]) == "iterator"
+    assert partition_collection_kind(pd.DataFrame) is None
+
+
+def test_lazy_partition_mapping_loads_on_access(tmp_path: Path):
+    loaded = []
+
+    def load(path: Path) -> str:
+        loaded.append(path)
+        return path.name
+
+    partitions = LazyPartitionMapping(
+        load,
+        {"2025-01-01": tmp_path / "a.csv", "2025-01-02": tmp_path / "b.csv"},
+    )
+
+    assert list(partitions) == ["2025-01-01", "2025-01-02"]
+    assert loaded == []
+
+    assert partitions["2025-01-02"] == "b.csv"
+    assert loaded == [tmp_path / "b.csv"]
+
+
+def test_lazy_partition_mapping_reads_ahead_in_order(tmp_path: Path):
+    """Items are loaded concurrently up to max_workers, but yielded in key order"""
+    paths = {f"2025-01-0{day}": tmp_path / f"{day}.csv" for day in range(1, 6)}
+    loaded = []
+
+    def load(path: Path) -> str:
+        loaded.append(path)
+        return path.name
+
+    partitions = LazyPartitionMapping(load, paths, max_workers=2)
+    items = partitions.items()
+
+    assert next(items) == ("2025-01-01", "1.csv")
+    assert len(loaded) <= 3
+
+    assert list(items) == [(key, path.name) for key, path in list(paths.items())[1:]]
+    assert sorted(loaded) == sorted(paths.values())
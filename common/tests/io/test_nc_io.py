@@ -0,0 +1,230 @@
+import os
+from pathlib import Path
+from types import SimpleNamespace
+
+import dagster as dg
+import dask.array
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+from xarray.backends.file_manager import FILE_CACHE
+
+from common.io import base
+from common.io import tags as io
+from common.io.csv_io import PandasCsvIoManager
+from common.io.datastore import Datastore
+from common.io.nc_io import AppendError, XarrayNcIoManager, append_records
+
+
+def hourly_ds(start: str, periods: int) -> xr.Dataset:
+    """Dataset with a value for each hour from start"""
+    times = pd.date_range(start, periods=periods, freq="1h")
+    return xr.Dataset(
+        {"temp": ("time", np.arange(periods, dtype=float))},
+        coords={"time": times},
+    )
+
+
+def write(nc_io: XarrayNcIoManager, ds: xr.Dataset) -> dict:
+    """Handle an appendable output, and return the output metadata"""
+    context = dg.build_output_context(
+        definition_metadata={
+            io.DESIRED_PATH: "monthly.nc",
+            io.APPEND_DIM: "time",
+        },
+    )
+    nc_io.handle_output(context, ds)
+    return context.get_logged_metadata()
+
+
+@pytest.fixture
+def nc_io(tmp_path: Path) -> XarrayNcIoManager:
+    datastore = Datastore(path_stub="test_stub", test_path=str(tmp_path))
+    return XarrayNcIoManager(datastore=datastore)
+
+
+def test_nc_io_first_write(nc_io: XarrayNcIoManager, tmp_path: Path):
+    metadata = write(nc_io, hourly_ds("2025-01-01", 3))
+
+    written = xr.load_dataset(tmp_path / "test_stub" / "monthly.nc")
+    assert metadata["nc.write_mode"].value == "full"
+    assert written.sizes["time"] == 3
+
+
+def test_nc_io_appends_later_records(nc_io: XarrayNcIoManager, tmp_path: Path):
+    write(nc_io, hourly_ds("2025-01-01T00", 3))
+
+    metadata = write(nc_io, hourly_ds("2025-01-01T03", 2))
+
+    written = xr.load_dataset(tmp_path / "test_stub" / "monthly.nc")
+    assert metadata["nc.write_mode"].value == "append"
+    assert written["temp"].to_numpy().tolist() == [0, 1, 2, 0, 1]
+    assert written.indexes["time"].is_monotonic_increasing
+
+
+def test_nc_io_replaces_overlapping_records(nc_io: XarrayNcIoManager, tmp_path: Path):
+    write(nc_io, hourly_ds("2025-01-01T00", 4))
+
+    metadata = write(nc_io, hourly_ds("2025-01-01T02", 3))
+
+    written = xr.load_dataset(tmp_path / "test_stub" / "monthly.nc")
+    assert metadata["nc.write_mode"].value == "append"
+    assert written.sizes["time"] == 5
+    assert written["temp"].to_numpy().tolist() == [0, 1, 0, 1, 2]
+
+
+def test_nc_io_empty_dataset_leaves_file(nc_io: XarrayNcIoManager, tmp_path: Path):
+    write(nc_io, hourly_ds("2025-01-01T00", 3))
+
+    metadata = write(nc_io, hourly_ds("2025-01-01T00", 0))
+
+    written = xr.load_dataset(tmp_path / "test_stub" / "monthly.nc")
+    assert metadata["nc.write_mode"].value == "unchanged"
+    assert written.sizes["time"] == 3
+
+
+def test_append_records_checks_variables(nc_io: XarrayNcIoManager, tmp_path: Path):
+    write(nc_io, hourly_ds("2025-01-01T00", 3))
+    path = tmp_path / "test_stub" / "monthly.nc"
+    extra = hourly_ds("2025-01-01T03", 1).assign(sal=("time", [30.0]))
+
+    with pytest.raises(AppendError):
+        append_records(extra, path, "time", 3)
+
+    assert xr.load_dataset(path).sizes["time"] == 3
+
+
+def partitioned_input_context(keys: list[str]) -> dg.InputContext:
+    """Monthly input context for daily partitions, merged into monthly.nc"""
+    daily_partitions = dg.DailyPartitionsDefinition(start_date=keys[0])
+    return dg.build_input_context(
+        partition_key="2025-01-01",
+        asset_partitions_def=daily_partitions,
+        asset_partition_key_range=dg.PartitionKeyRange(keys[0], keys[-1]),
+        definition_metadata={io.INCREMENTAL_TARGET_PATH: "monthly.nc"},
+        upstream_output=dg.build_output_context(
+            definition_metadata={io.DESIRED_PATH: "daily/{partition_key}.csv"},
+        ),
+    )
+
+
+def touch(path: Path, mtime: float) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+    os.utime(path, (mtime, mtime))
+
+
+def test_partition_keys_to_load(tmp_path: Path):
+    datastore = Datastore(path_stub="test_stub", test_path=str(tmp_path))
+    csv_io = PandasCsvIoManager(datastore=datastore)
+    base = tmp_path / "test_stub"
+    keys = ["2025-01-01", "2025-01-02", "2025-01-03"]
+    for key in keys:
+        touch(base / f"daily/{key}.csv", 1_000)
+
+    # Without the target, every partition is loaded
+    assert csv_io.partition_keys_to_load(partitioned_input_context(keys)) == keys
+
+    # Only partitions written after the target are loaded
+    touch(base / "monthly.nc", 2_000)
+    touch(base / "daily/2025-01-03.csv", 3_000)
+    assert csv_io.partition_keys_to_load(partitioned_input_context(keys)) == [
+        "2025-01-03",
+    ]
+
+    # An earlier changed partition means a full rebuild
+    touch(base / "daily/2025-01-01.csv", 3_000)
+    assert csv_io.partition_keys_to_load(partitioned_input_context(keys)) == keys
+
+
+def test_loading_time_applied_after_write(
+    nc_io: XarrayNcIoManager,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """The target gets the time loading started, but only once it is written"""
+    datastore = Datastore(path_stub="test_stub", test_path=str(tmp_path))
+    csv_io = PandasCsvIoManager(datastore=datastore)
+    touch(tmp_path / "test_stub" / "daily/2025-01-01.csv", 1_000)
+    monkeypatch.setattr(base, "time", SimpleNamespace(time=lambda: 1_500.0))
+
+    csv_io.partition_keys_to_load(partitioned_input_context(["2025-01-01"]))
+    assert sorted(path.name for path in (tmp_path / "test_stub").iterdir()) == [
+        "daily",
+    ]
+
+    write(nc_io, hourly_ds("2025-01-01", 3))
+    assert (tmp_path / "test_stub" / "monthly.nc").stat().st_mtime == 1_500.0
+
+
+def test_nc_io_loads_into_memory(nc_io: XarrayNcIoManager, tmp_path: Path):
+    """Loaded datasets don't depend on the file staying open or unchanged"""
+    write(nc_io, hourly_ds("2025-01-01", 3))
+    path = tmp_path / "test_stub" / "monthly.nc"
+
+    ds = nc_io.load_input(
+        dg.build_input_context(
+            upstream_output=dg.build_output_context(
+                definition_metadata={io.DESIRED_PATH: "monthly.nc"},
+            ),
+        ),
+    )
+    path.unlink()
+
+    assert ds["temp"].to_numpy().tolist() == [0, 1, 2]
+
+
+def test_nc_io_size_metadata(nc_io: XarrayNcIoManager, tmp_path: Path):
+    """Written outputs report their size and how well they compressed"""
+    ds = xr.Dataset(
+        {"temp": ("time", np.zeros(10_000))},
+        coords={"time": pd.date_range("2025-01-01", periods=10_000, freq="1min")},
+    )
+    context = dg.build_output_context(
+        definition_metadata={
+            io.DESIRED_PATH: "compressed.nc",
+            io.NC_ENCODING: {"compression": "zlib", "complevel": 4},
+        },
+    )
+
+    nc_io.handle_output(context, ds)
+    metadata = context.get_logged_metadata()
+
+    size = (tmp_path / "test_stub" / "compressed.nc").stat().st_size
+    assert metadata["nc.bytes"].value == size
+    assert metadata["nc.compression_ratio"].value == pytest.approx(ds.nbytes / size)
+    assert metadata["nc.compression_ratio"].value > 1
+
+
+def is_open(path: Path) -> bool:
+    """Does xarray have a file handle open for the path"""
+    return any(str(path) in repr(key) for key in FILE_CACHE)
+
+
+def test_nc_io_loads_chunked_inputs_lazily(nc_io: XarrayNcIoManager, tmp_path: Path):
+    """Inputs with io.CHUNKS are Dask backed, and closed after the step"""
+    path = tmp_path / "test_stub" / "hourly.nc"
+    loaded = {}
+
+    @dg.asset(metadata={io.DESIRED_PATH: "hourly.nc"})
+    def hourly() -> xr.Dataset:
+        return hourly_ds("2025-01-01", 6)
+
+    @dg.asset(ins={"hourly": dg.AssetIn(metadata={io.CHUNKS: {"time": 2}})})
+    def summary(hourly: xr.Dataset) -> None:
+        loaded["is_dask"] = isinstance(hourly["temp"].data, dask.array.Array)
+        loaded["chunks"] = dict(hourly.chunks)
+        loaded["open"] = is_open(path)
+        loaded["mean"] = float(hourly["temp"].mean())
+
+    result = dg.materialize([hourly, summary], resources={"io_manager": nc_io})
+
+    assert result.success
+    assert loaded == {
+        "is_dask": True,
+        "chunks": {"time": (2, 2, 2)},
+        "open": True,
+        "mean": 2.5,
+    }
+    assert not is_open(path)
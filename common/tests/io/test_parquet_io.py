@@ -0,0 +1,78 @@
+from pathlib import Path
+
+import dagster as dg
+import pandas as pd
+import pyarrow.parquet as pq
+
+from common.io import tags as io
+from common.io.datastore import Datastore
+from common.io.parquet_io import PandasParquetIoManager
+
+
+def test_parquet_io_keeps_dtypes(tmp_path: Path):
+    """Datetime and float dtypes survive a round trip through Parquet"""
+    datastore = Datastore(path_stub="test_stub", test_path=str(tmp_path))
+    parquet_io = PandasParquetIoManager(datastore=datastore)
+
+    df_to_write = pd.DataFrame(
+        {
+            "time": pd.to_datetime(["2025-11-12T00:00:00", "2025-11-12T00:10:00"]),
+            "temp": [10.5, 11.5],
+        },
+    )
+
+    output_context = dg.build_output_context(
+        definition_metadata={io.DESIRED_PATH: "test_output.parquet"},
+    )
+    parquet_io.handle_output(output_context, df_to_write)
+
+    input_context = dg.build_input_context(
+        upstream_output=dg.build_output_context(
+            definition_metadata={io.DESIRED_PATH: "test_output.parquet"},
+        ),
+    )
+    df_read = parquet_io.load_input(input_context)
+
+    pd.testing.assert_frame_equal(df_to_write, df_read)
+    schema = pq.read_schema(tmp_path / "test_stub" / "test_output.parquet")
+    assert schema.field("time").type.unit == df_to_write["time"].dt.unit
+
+
+def test_parquet_io_column_projection(tmp_path: Path):
+    """Inputs can choose which columns are loaded"""
+    datastore = Datastore(path_stub="test_stub", test_path=str(tmp_path))
+    parquet_io = PandasParquetIoManager(datastore=datastore)
+
+    test_dir = tmp_path / "test_stub"
+    test_dir.mkdir(parents=True)
+    pd.DataFrame({"a": [1, 2], "b": [3, 4]}).to_parquet(test_dir / "input.parquet")
+
+    input_context = dg.build_input_context(
+        definition_metadata={io.COLUMNS: ["b"]},
+        upstream_output=dg.build_output_context(
+            definition_metadata={io.DESIRED_PATH: "input.parquet"},
+        ),
+    )
+    df_read = parquet_io.load_input(input_context)
+
+    assert list(df_read.columns) == ["b"]
+
+
+def test_parquet_io_csv_export(tmp_path: Path):
+    """Outputs can also export an ERDDAP compatible CSV"""
+    datastore = Datastore(path_stub="test_stub", test_path=str(tmp_path))
+    parquet_io = PandasParquetIoManager(datastore=datastore)
+
+    df_to_write = pd.DataFrame({"x": [10, 20, 30]})
+
+    output_context = dg.build_output_context(
+        definition_metadata={
+            io.DESIRED_PATH: "partitions/{partition_key_dt:%Y-%m-%d}.parquet",
+            io.CSV_EXPORT_PATH: "partitions/{partition_key_dt:%Y-%m-%d}.csv",
+        },
+        partition_key="2023-10-01",
+    )
+    parquet_io.handle_output(output_context, df_to_write)
+
+    df_read = pd.read_csv(tmp_path / "test_stub" / "partitions" / "2023-10-01.csv")
+    pd.testing.assert_frame_equal(df_to_write, df_read)
@@ -0,0 +1,120 @@
+import os
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import pandas as pd
+from fsspec.implementations.memory import MemoryFileSystem
+
+from common.readers.incremental_csv import IncrementalCSVReader
+from common.readers.pandas_csv import PandasCSVReader
+
+KEY = "/bucket/met_20251112.txt"
+
+
+def write(fs: MemoryFileSystem, content: str, etag: str) -> dict[str, dict]:
+    fs.pipe_file(KEY, content.encode())
+    return {KEY: {"size": len(content.encode()), "ETag": etag}}
+
+
+def read(
+    fs: MemoryFileSystem,
+    tmp_path: Path,
+    infos: dict,
+    reader: PandasCSVReader | None = None,
+) -> tuple[pd.DataFrame, dict]:
+    incremental_reader = IncrementalCSVReader(
+        reader or PandasCSVReader(sep=",", comment="#"),
+        fs,
+        tmp_path / "state",
+    )
+    return incremental_reader.read(infos)[KEY], incremental_reader.stats
+
+
+def test_incremental_reads_append_only_new_rows(tmp_path: Path):
+    fs = MemoryFileSystem()
+    header = "# station EW01\ntime,value\n"
+
+    df, stats = read(fs, tmp_path, write(fs, header + "1,1.5\n2,2.5\n", '"a"'))
+    assert df["value"].tolist() == [1.5, 2.5]
+    assert stats["full"] == 1
+
+    df, stats = read(fs, tmp_path, write(fs, header + "1,1.5\n2,2.5\n", '"a"'))
+    assert df["value"].tolist() == [1.5, 2.5]
+    assert stats["unchanged"] == 1
+
+    # A partial last line is included, but read again next time
+    infos = write(fs, header + "1,1.5\n2,2.5\n3,3.5\n4,4", '"b"')
+    df, stats = read(fs, tmp_path, infos)
+    assert df["time"].tolist() == [1, 2, 3, 4]
+    assert stats["appended"] == 1
+
+    infos = write(fs, header + "1,1.5\n2,2.5\n3,3.5\n4,4.5\n", '"c"')
+    df, stats = read(fs, tmp_path, infos)
+    assert df["value"].tolist() == [1.5, 2.5, 3.5, 4.5]
+    assert stats["appended"] == 1
+
+
+def test_incremental_reads_fall_back_when_rewritten(tmp_path: Path):
+    fs = MemoryFileSystem()
+
+    read(fs, tmp_path, write(fs, "time,value\n1,1.5\n2,2.5\n", '"a"'))
+
+    df, stats = read(
+        fs, tmp_path, write(fs, "time,value\n1,9.5\n2,2.5\n3,3.5\n", '"b"')
+    )
+    assert df["value"].tolist() == [9.5, 2.5, 3.5]
+    assert stats["full"] == 1
+
+    # Going back to an earlier version is also a rewrite
+    df, stats = read(fs, tmp_path, write(fs, "time,value\n1,1.5\n2,2.5\n", '"a"'))
+    assert df["value"].tolist() == [1.5, 2.5]
+    assert stats["full"] == 1
+
+
+def test_incremental_reads_check_the_header(tmp_path: Path):
+    """A rewrite before the fingerprinted bytes is caught by the header"""
+    fs = MemoryFileSystem()
+    rows = "".join(f"{i},{i}.5\n" for i in range(200))
+
+    read(fs, tmp_path, write(fs, "time,value\n" + rows, '"a"'))
+
+    df, stats = read(fs, tmp_path, write(fs, "time,speed\n" + rows + "200,1\n", '"b"'))
+    assert "speed" in df.columns
+    assert stats["full"] == 1
+
+
+def test_incremental_reads_are_kept_by_reader_settings(tmp_path: Path):
+    fs = MemoryFileSystem()
+    infos = write(fs, "time,value\n1,1.5\n", '"a"')
+
+    read(fs, tmp_path, infos)
+    df, stats = read(
+        fs, tmp_path, infos, PandasCSVReader(sep=",", dtype={"value": "str"})
+    )
+    assert df["value"].tolist() == ["1.5"]
+    assert stats["full"] == 1
+
+    _, stats = read(fs, tmp_path, infos)
+    assert stats["unchanged"] == 1
+
+
+def test_incremental_reads_evict_unused_state(tmp_path: Path):
+    fs = MemoryFileSystem()
+    other_key = "/bucket/met_20251111.txt"
+    fs.pipe_file(other_key, b"time,value\n1,1.5\n")
+    infos = {
+        **write(fs, "time,value\n1,1.5\n", '"a"'),
+        other_key: {"size": 17, "ETag": '"b"'},
+    }
+
+    reader = IncrementalCSVReader(PandasCSVReader(sep=","), fs, tmp_path / "state")
+    reader.read(infos)
+    assert len(list((tmp_path / "state").iterdir())) == 4
+
+    week_ago = time.time() - timedelta(days=8).total_seconds()
+    for path in (tmp_path / "state").iterdir():
+        os.utime(path, (week_ago, week_ago))
+
+    reader.read({KEY: infos[KEY]})
+    assert sorted((tmp_path / "state").iterdir()) == sorted(reader.paths(KEY))
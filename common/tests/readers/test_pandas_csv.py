@@ -0,0 +1,87 @@
+from io import BytesIO
+from pathlib import Path
+
+import pandas as pd
+import pydantic
+import pytest
+
+from common.readers.pandas_csv import PandasCSVReader
+
+
+class UnseekableBytesIO(BytesIO):
+    """Stream that can only be read once, like a network response"""
+
+    def seekable(self) -> bool:
+        return False
+
+
+def test_default_reader_kwargs_are_unchanged():
+    assert PandasCSVReader().reader_kwargs() == {
+        "sep": None,
+        "comment": None,
+        "na_values": "None",
+    }
+
+
+def test_pyarrow_engine_options_are_validated():
+    with pytest.raises(pydantic.ValidationError, match="comment"):
+        PandasCSVReader(engine="pyarrow", sep=",", comment="#")
+
+    with pytest.raises(pydantic.ValidationError, match="sep"):
+        PandasCSVReader(engine="pyarrow")
+
+
+def test_reader_parses_dates_and_projects_columns():
+    reader = PandasCSVReader(
+        sep=",",
+        engine="c",
+        usecols=["time", "wind"],
+        parse_dates=["time"],
+        date_format="%Y-%m-%d %H:%M",
+    )
+    df = reader.read_df(
+        BytesIO(b"time,wind,extra\n2025-11-12 00:00,1,a\n2025-11-12 00:10,2,b\n"),
+    )
+
+    assert list(df.columns) == ["time", "wind"]
+    assert pd.api.types.is_datetime64_any_dtype(df["time"])
+
+
+def test_reader_infers_schema_from_first_file():
+    reader = PandasCSVReader(sep=",", infer_schema=True)
+
+    first = reader.read_df(BytesIO(b"time,wind,note\n1,2,a\n"))
+    assert first["wind"].dtype == "int64"
+
+    # Later files use the widened schema, even if they'd infer differently
+    second = reader.read_df(BytesIO(b"time,wind,note\n3,4,b\n"))
+    assert second["wind"].dtype == "float64"
+    assert pd.api.types.is_string_dtype(second["note"])
+
+    # and fall back to inferring again if they don't fit
+    third = reader.read_df(BytesIO(b"time,wind,note\nx,4,b\n"))
+    assert third["time"].tolist() == ["x"]
+
+
+def test_reader_raises_when_stream_cant_be_read_again(tmp_path: Path):
+    reader = PandasCSVReader(sep=",", infer_schema=True)
+    reader.read_df(BytesIO(b"time,wind\n1,2\n"))
+
+    path = tmp_path / "met.csv"
+    path.write_bytes(b"time,wind\nx,4\n")
+
+    # Paths are reopened to infer the schema again
+    assert reader.read_df(path)["time"].tolist() == ["x"]
+
+    reader.read_df(BytesIO(b"time,wind\n1,2\n"))
+    with pytest.raises(ValueError):
+        reader.read_df(UnseekableBytesIO(b"time,wind\n1,y\n"))
+
+
+def test_reader_with_columns_ignores_missing_columns():
+    reader = PandasCSVReader(sep=",").with_columns({"time", "wind", "depth"})
+
+    df = reader.read_df(BytesIO(b"time,wind,extra\n1,2,a\n"))
+
+    assert list(df.columns) == ["time", "wind"]
+    assert PandasCSVReader(sep=",").reader_kwargs().get("usecols") is None
@@ -0,0 +1,33 @@
+import os
+from pathlib import Path
+
+from common.resource.object_cache import ObjectCache
+
+
+def test_object_cache_by_version(tmp_path: Path):
+    cache = ObjectCache(tmp_path, max_bytes=1024)
+
+    assert cache.get("bucket/a.txt", '"1"') is None
+    cache.put("bucket/a.txt", '"1"', b"first")
+
+    assert cache.get("bucket/a.txt", '"1"') == b"first"
+    assert cache.get("bucket/a.txt", '"2"') is None
+    assert cache.get("bucket/a.txt", None) is None
+
+    assert cache.stats() == {"hits": 1, "misses": 3}
+
+
+def test_object_cache_evicts_least_recently_used(tmp_path: Path):
+    cache = ObjectCache(tmp_path, max_bytes=20)
+
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.put(key, "v", b"0123456789")
+        os.utime(cache.object_path(key, "v"), (i, i))
+
+    # Reading a marks it as recently used, so b is evicted first
+    assert cache.get("a", "v") == b"0123456789"
+    cache.evict()
+
+    assert cache.get("b", "v") is None
+    assert cache.get("a", "v") is not None
+    assert cache.get("c", "v") is not None
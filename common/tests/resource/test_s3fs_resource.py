@@ -0,0 +1,33 @@
+from pathlib import Path
+
+from fsspec.implementations.memory import MemoryFileSystem
+
+from common.resource.object_cache import ObjectCache
+from common.resource.s3fs_resource import S3Credentials, S3FSResource
+
+
+class ListedOnlyFileSystem(MemoryFileSystem):
+    """Memory filesystem that fails on per key info requests"""
+
+    def info(self, path, **kwargs):
+        raise AssertionError(f"Unexpected info request for {path}")
+
+
+def test_cat_objects_caches_by_listed_etags(tmp_path: Path):
+    resource = S3FSResource(
+        credentials=S3Credentials(
+            access_key_id="test",
+            secret_access_key="test",  # noqa: S106
+        ),
+        region_name="us-east-1",
+        cache_path=str(tmp_path),
+    )
+    resource._fs = ListedOnlyFileSystem()
+    resource._cache = ObjectCache(tmp_path, max_bytes=1024)
+
+    resource.fs.pipe_file("/bucket/a.txt", b"first")
+    infos = {"/bucket/a.txt": {"ETag": '"1"'}}
+
+    assert resource.cat_objects(["/bucket/a.txt"], infos) == {"/bucket/a.txt": b"first"}
+    assert resource.cat_objects(["/bucket/a.txt"], infos) == {"/bucket/a.txt": b"first"}
+    assert resource.cache_stats() == {"hits": 1, "misses": 1}
@@ -0,0 +1,49 @@
+import pandas as pd
+
+from common.dtypes import NumericCoercer
+
+
+def test_coerce_drops_sentinel_rows_and_converts_text():
+    """Rows with sentinels are dropped and text columns become numeric"""
+    df = pd.DataFrame(
+        {
+            "time": ["2025-11-12T00:00:00", "2025-11-12T00:10:00", "NAN"],
+            "temp": ["10.5", "NAN", "11.5"],
+            "count": ["1", "2", "3"],
+            "speed": [1.0, 2.0, 3.0],
+        },
+    )
+
+    coercer = NumericCoercer(na_values=["NAN"], ignore_columns=["time"])
+    result = coercer.coerce(df)
+
+    assert list(result.index) == [0, 2]
+    assert result["temp"].dtype == "float64"
+    assert result["count"].dtype == "int64"
+    assert result["time"].tolist() == ["2025-11-12T00:00:00", "NAN"]
+    assert coercer.schema == {"temp": "float64", "count": "int64", "speed": "float64"}
+    assert coercer.failures == {}
+
+
+def test_coerce_reuses_schema_and_reports_failures():
+    """The schema is cached, and unconvertable columns are reported"""
+    coercer = NumericCoercer(na_values=["NAN"])
+
+    first = coercer.coerce(pd.DataFrame({"temp": ["10.5"], "site": ["a"]}))
+    assert first["temp"].dtype == "float64"
+    assert first["site"].dtype != "float64"
+    assert set(coercer.failures) == {"site"}
+
+    second = coercer.coerce(pd.DataFrame({"temp": ["oops"], "site": ["b"]}))
+    assert second["temp"].tolist() == ["oops"]
+    assert set(coercer.failures) == {"site", "temp"}
+
+
+def test_coerce_keeps_na_rows_without_sentinels():
+    """Without NA values configured, no rows are dropped"""
+    df = pd.DataFrame({"temp": ["10.5", None]})
+
+    result = NumericCoercer().coerce(df)
+
+    assert len(result) == 2
+    assert result["temp"].dtype == "float64"
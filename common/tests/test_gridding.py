@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from common.gridding import grid_profile
+
+
+def irregular_profiles():
+    return pd.DataFrame(
+        {
+            "time": pd.to_datetime(
+                [
+                    "2025-01-01T00:10",
+                    "2025-01-01T00:00",
+                    "2025-01-01T00:00",
+                    "2025-01-01T00:10",
+                    "2025-01-01T00:20",
+                ],
+            ),
+            "depth": [2.0, 2.0, 4.0, 6.0, 4.0],
+            "speed": [0.3, 0.1, 0.2, 0.4, 0.5],
+            "count": [3, 1, 2, 4, 5],
+        },
+    )
+
+
+def test_grid_profile_matches_to_xarray():
+    df = irregular_profiles()
+    expected = (
+        df.sort_values(["time", "depth"]).set_index(["time", "depth"]).to_xarray()
+    )
+
+    ds = grid_profile(df)
+
+    xr.testing.assert_identical(ds, expected)
+    assert ds["count"].dtype == np.float64
+
+
+def test_grid_profile_complete_keeps_dtype():
+    df = irregular_profiles().iloc[:3]
+    df = pd.concat([df, df.assign(time=df["time"] + pd.Timedelta(hours=1))])
+    df = df[df["depth"] != 4.0]
+
+    ds = grid_profile(df)
+
+    assert ds["count"].dims == ("time", "depth")
+    assert ds["count"].dtype == df["count"].dtype
+    assert ds["count"].shape == (4, 1)
+
+
+def test_grid_profile_keeps_first_duplicate():
+    df = irregular_profiles()
+    df = pd.concat([df, df.assign(speed=-1.0)], ignore_index=True)
+
+    ds = grid_profile(df)
+
+    assert (ds["speed"] >= 0).sum() == len(irregular_profiles())
+    assert not (ds["speed"] == -1.0).any()
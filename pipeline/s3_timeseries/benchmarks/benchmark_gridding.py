@@ -0,0 +1,84 @@
+"""Compare gridding a month of profile data with `to_xarray` and `grid_profile`.
+
+Builds a synthetic month of 1 minute profiles with 50 depth bins, where
+each profile is missing some bins, then reports the time and peak
+memory that each approach takes to make a (time, depth) dataset.
+
+    pixi run -e dev python benchmarks/benchmark_gridding.py
+"""
+
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from common.gridding import grid_profile
+
+DAYS = 30
+BINS = 50
+# Share of (time, depth) cells without a measurement
+MISSING = 0.1
+VARIABLES = ["speed", "direction", "echo", "correlation"]
+
+
+def synthetic_month(seed: int = 0) -> pd.DataFrame:
+    """Long format profiles, with a row per time and depth that was measured"""
+    rng = np.random.default_rng(seed)
+    times = pd.date_range("2025-01-01", periods=DAYS * 24 * 60, freq="1min")
+    depths = np.arange(1, BINS + 1) * 0.5
+
+    time_values = np.repeat(times.to_numpy(), BINS)
+    depth_values = np.tile(depths, len(times))
+    keep = rng.random(len(time_values)) >= MISSING
+
+    df = pd.DataFrame({"time": time_values[keep], "depth": depth_values[keep]})
+    for variable in VARIABLES:
+        df[variable] = rng.random(len(df))
+    df["status"] = rng.integers(0, 4, len(df))
+    return df
+
+
+def with_to_xarray(df: pd.DataFrame):
+    """Gridding as monthly_ds used to"""
+    df = df.sort_values(["time", "depth"])
+    df = df.drop_duplicates(subset=["time", "depth"])
+    return df.set_index(["time", "depth"]).to_xarray()
+
+
+def with_grid_profile(df: pd.DataFrame):
+    return grid_profile(df, "time", "depth")
+
+
+def peak_memory(function, df: pd.DataFrame) -> float:
+    """Peak MiB allocated while gridding the frame"""
+    tracemalloc.start()
+    function(df)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2**20
+
+
+def main():
+    df = synthetic_month()
+    print(
+        f"{len(df):,} rows, {df['time'].nunique():,} times, "
+        f"{df['depth'].nunique()} depths, {df.memory_usage().sum() / 2**20:.0f} MiB",
+    )
+
+    for name, function in [
+        ("to_xarray", with_to_xarray),
+        ("grid_profile", with_grid_profile),
+    ]:
+        # Time without tracing, which slows allocations down
+        start = time.perf_counter()
+        function(df)
+        seconds = time.perf_counter() - start
+
+        print(
+            f"  {name:13} {seconds:7.2f} s  {peak_memory(function, df):8.0f} MiB peak",
+        )
+
+
+if __name__ == "__main__":
+    main()
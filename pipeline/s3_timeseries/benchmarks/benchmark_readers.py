@@ -0,0 +1,137 @@
+"""Compare CSV parser engines on a day of source files for test datasets.
+
+Downloads the day's files once with the `S3_TS_*` credentials, then times
+reading them with each engine. Without credentials, hourly stand-in source
+files are rebuilt from the dataset's daily snapshot in the test data.
+
+Engines that can't skip comments (pyarrow) are timed on a variant that
+drops comment lines before parsing, with the stripping included in the time.
+
+    pixi run -e dev python benchmarks/benchmark_readers.py
+"""
+
+import os
+import sys
+import timeit
+from datetime import date
+from io import BytesIO
+from pathlib import Path
+
+import pandas as pd
+import pydantic
+from s3fs import S3FileSystem
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+from pipeline import S3TimeseriesDataset
+
+TEST_DATA_DIR = Path("/mnt/test-data/s3_timeseries/")
+
+# Fixture, config creation time, and partition date to benchmark
+DATASETS = [
+    ("empire_met", "2026-01-05T21:15:24.530Z", "2025-11-13"),
+    ("south_fork_waves", "2026-04-08T19:36:09.281Z", "2026-02-21"),
+    ("south_fork_currents", "2026-04-08T19:35:09.835Z", "2026-03-04"),
+]
+ENGINES = ["c", "pyarrow", "python"]
+REPEAT = 5
+
+
+def download_day(fs: S3FileSystem, dataset: S3TimeseriesDataset, day: str) -> list:
+    """Source file contents for a day"""
+    day_glob = (
+        dataset.config.s3_source.bucket
+        + dataset.config.s3_source.prefix
+        + dataset.config.file_pattern.glob(date.fromisoformat(day))
+    )
+    keys = sorted(fs.glob(day_glob))
+    return [fs.cat_file(key) for key in keys]
+
+
+def snapshot_day(name: str, dataset: S3TimeseriesDataset, day: str) -> list[bytes]:
+    """Hourly stand-in source files rebuilt from a daily snapshot"""
+    path = next((TEST_DATA_DIR / name).glob(f"*{day.replace('-', '')}.csv"))
+    df = pd.read_csv(path)
+
+    reader = dataset.config.reader
+    header = "".join(f"{reader.comment} {name} {day}\n" for _ in range(5))
+    if reader.comment is None:
+        header = ""
+
+    return [
+        header.encode() + hour.to_csv(index=False, sep=reader.sep or ",").encode()
+        for _, hour in df.groupby(df["datetime"].str[:13])
+    ]
+
+
+def strip_comments(content: bytes, comment: str) -> bytes:
+    """Drop comment lines, for engines that can't skip them"""
+    marker = comment.encode()
+    return b"".join(
+        line for line in BytesIO(content).readlines() if not line.startswith(marker)
+    )
+
+
+def variants(settings: dict):
+    """Labelled reader settings to time, and whether comments are stripped first"""
+    for engine in ENGINES:
+        for stripped in [False, True] if settings["comment"] else [False]:
+            for infer_schema in [False, True]:
+                overrides = {"engine": engine, "infer_schema": infer_schema}
+                label = engine
+                if stripped:
+                    overrides["comment"] = None
+                    label += " stripped"
+                if infer_schema:
+                    label += " (schema)"
+                yield label, settings | overrides, stripped
+
+
+def benchmark(dataset: S3TimeseriesDataset, contents: list[bytes]) -> None:
+    """Time reading the contents with each engine"""
+    settings = dataset.config.reader.model_dump()
+
+    for label, reader_settings, stripped in variants(settings):
+        try:
+            reader = type(dataset.config.reader).model_validate(reader_settings)
+        except pydantic.ValidationError as e:
+            print(f"  {label:26} skipped: {e.errors()[0]['msg']}")
+            continue
+
+        def read_all(reader=reader, stripped=stripped):
+            for content in contents:
+                if stripped:
+                    content = strip_comments(content, settings["comment"])
+                reader.read_df(BytesIO(content))
+
+        seconds = min(timeit.repeat(read_all, number=1, repeat=REPEAT))
+        print(f"  {label:26} {seconds * 1000:8.1f} ms")
+
+
+def main():
+    fs = None
+    if "S3_TS_ACCESS_KEY_ID" in os.environ:
+        fs = S3FileSystem(
+            key=os.environ["S3_TS_ACCESS_KEY_ID"],
+            secret=os.environ["S3_TS_SECRET_ACCESS_KEY"],
+        )
+
+    for name, created, day in DATASETS:
+        dataset = S3TimeseriesDataset.from_fixture(
+            TEST_DATA_DIR / f"fixtures/{name}.json",
+            created,
+        )
+        if fs is None:
+            source = "snapshot"
+            contents = snapshot_day(name, dataset, day)
+        else:
+            source = "S3"
+            contents = download_day(fs, dataset, day)
+        size = sum(len(content) for content in contents)
+        print(f"{name} {day} ({source}): {len(contents)} files, {size / 1024:.0f} KiB")
+
+        benchmark(dataset, contents)
+
+
+if __name__ == "__main__":
+    main()
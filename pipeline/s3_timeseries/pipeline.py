@@ -1,24 +1,40 @@
 import logging
-from datetime import date, datetime
+import re
+from collections.abc import Mapping
+from datetime import UTC, date, datetime, timedelta
+from io import BytesIO
 from textwrap import dedent
-from typing import Annotated
+from typing import Annotated, Literal, Self
 
 import boto3
 import dagster as dg
 import pandas as pd
 import sentry_sdk
 import xarray as xr
-from dagster_aws.s3.sensor import get_objects
-from parse import parse
-from pydantic import BaseModel, Field
+from botocore.exceptions import ClientError
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
 
-from common import assets, config, io
+from common import assets, config, gridding, io
 from common.backend_api import BackendAPIClient
 from common.config import attributes, mappings, s3_source
+from common.dtypes import NumericCoercer
+from common.readers.incremental_csv import IncrementalCSVReader
 from common.readers.pandas_csv import PandasCSVReader
 from common.resource.s3fs_resource import S3Credentials, S3FSResource
 from common.sentry import SentryConfig
 
+from s3_listing import (
+    BucketSensorCursor,
+    DayPatternMatcher,
+    PatternIndex,
+    RunCoalescing,
+    SensorCursor,
+    later_sequencer,
+    list_objects,
+    queue_region,
+    s3_event_records,
+)
+
 sentry = SentryConfig(pipeline_name="s3_timeseries")
 
 
@@ -39,6 +55,45 @@ class DayGlob(BaseModel):
         ),
     ] = None
 
+    _matcher: DayPatternMatcher | None = PrivateAttr(default=None)
+
+    @model_validator(mode="after")
+    def compile_day_pattern(self) -> Self:
+        """Compile the day pattern up front, so invalid patterns fail validation"""
+        if self.day_pattern is not None:
+            self._matcher = DayPatternMatcher(self.day_pattern)
+        return self
+
+    @property
+    def matcher(self) -> DayPatternMatcher:
+        """Compiled matcher for the day pattern"""
+        if self._matcher is None or self._matcher.day_pattern != self.day_pattern:
+            self._matcher = DayPatternMatcher(self.day_pattern)
+        return self._matcher
+
+    def glob(self, partition_date: date) -> str:
+        """Glob for a day's files"""
+        return self.matcher.glob(partition_date)
+
+    def start_after_key(self, partition_date: date) -> str | None:
+        """Key to start listing after to skip files from before `partition_date`.
+
+        Only available when the date directly follows a fixed prefix,
+        and is formatted so that keys sort chronologically.
+        """
+        if self.day_pattern is None:
+            return None
+
+        prefix, found, rest = self.day_pattern.partition("{partition_date:")
+        if not found or any(c in prefix for c in "*?[{"):
+            return None
+
+        date_format = rest.split("}")[0]
+        if not re.fullmatch(r"%Y[^%]*%m[^%]*%d", date_format):
+            return None
+
+        return prefix + partition_date.strftime(date_format)
+
 
 class S3TimeseriesConfig(
     config.DatasetConfigBase,
@@ -47,6 +102,7 @@ class S3TimeseriesConfig(
     s3_source.S3SourceMixin,
     attributes.AttributeConfigMixin,
     mappings.VariableConverterMixIn,
+    config.NcEncodingMixin,
 ):
     """Configuration for S3 Timeseries Dataset."""
 
@@ -73,6 +129,90 @@ class S3TimeseriesConfig(
     ] = None
     station: Annotated[str, Field(description="Station name/timeseries_id")]
 
+    daily_format: Annotated[
+        Literal["csv", "parquet"],
+        Field(
+            description=(
+                "Format to store intermediate daily data in. "
+                "Parquet keeps data types and is faster to load."
+            ),
+        ),
+    ] = "csv"
+    daily_csv_export: Annotated[
+        bool,
+        Field(
+            description="When storing daily data as Parquet, also export an ERDDAP compatible CSV",
+        ),
+    ] = False
+
+    incremental_monthly: Annotated[
+        bool,
+        Field(
+            description=(
+                "Only merge changed daily data into the monthly NetCDF, "
+                "rather than rebuilding the whole month each time"
+            ),
+        ),
+    ] = False
+
+    project_columns: Annotated[
+        bool,
+        Field(
+            description=(
+                "Only parse the source columns that the variable mappings, "
+                "attributes, and converters use"
+            ),
+        ),
+    ] = False
+
+    convert_after_concat: Annotated[
+        bool,
+        Field(
+            description=(
+                "Run the variable converters once on the day's concatenated files, "
+                "rather than on each file"
+            ),
+        ),
+    ] = False
+
+    incremental_reads: Annotated[
+        bool,
+        Field(
+            description=(
+                "Only fetch the bytes appended to source files since the last run, "
+                "for sources that append to the same daily file during the day"
+            ),
+        ),
+    ] = False
+
+    run_coalescing: Annotated[
+        RunCoalescing,
+        Field(
+            default_factory=RunCoalescing,
+            description=(
+                "Debounce and rate limit runs for days that keep receiving files"
+            ),
+        ),
+    ]
+
+    sensor_lookback_days: Annotated[
+        int,
+        Field(
+            description=(
+                "Days before the most recent file to keep relisting, "
+                "to catch late or rewritten files"
+            ),
+            ge=0,
+        ),
+    ] = 2
+
+    def source_columns(self) -> set[str]:
+        """Source columns that are needed to build the output dataset."""
+        needed = {var_map.source for var_map in self.variable_mappings}
+        needed |= set(self.attributes.variables)
+        needed |= {self.source_time_var, "depth"}
+        return mappings.converter_source_columns(self.variable_converter, needed)
+
 
 class S3TimeseriesDataset(config.DatasetBase):
     """S3 Timeseries Dataset."""
@@ -82,13 +222,25 @@ class S3TimeseriesDataset(config.DatasetBase):
         Field(description="The configuration for the dataset."),
     ]
 
-    def daily_partition_path(self):
-        """Path to daily partitions."""
+    def daily_partition_path(self, extension: str | None = None):
+        """Path to daily partitions, defaulting to the configured daily format."""
         return (
             self.safe_slug
-            + "/daily/{partition_key_dt:%Y}/{partition_key_dt:%m}/{partition_key_dt:%Y-%m-%d}.csv"
+            + "/daily/{partition_key_dt:%Y}/{partition_key_dt:%m}/{partition_key_dt:%Y-%m-%d}."
+            + (extension or self.config.daily_format)
+        )
+
+    def daily_partitions_def(self) -> dg.DailyPartitionsDefinition:
+        """Daily partitions from the dataset start date."""
+        return dg.DailyPartitionsDefinition(
+            start_date=self.config.start_date.isoformat(),
+            end_offset=1,
         )
 
+    def daily_job_name(self) -> str:
+        """Name of the job that updates daily partitions."""
+        return f"update_{self.safe_slug}_daily"
+
     def monthly_partition_path(self):
         """Path to monthly partitions."""
         return (
@@ -100,31 +252,586 @@ class S3TimeseriesDataset(config.DatasetBase):
         )
 
 
-def defs_for_dataset(dataset: S3TimeseriesDataset) -> dg.Definitions:  # noqa: C901
-    """Definitions for a single S3 Timeseries dataset."""
+def in_flight_partitions(
+    instance: dg.DagsterInstance,
+    job_name: str,
+    partition_keys: list[str],
+) -> set[str]:
+    """Partitions out of `partition_keys` that already have a run queued or in progress"""
+    if not partition_keys:
+        return set()
+
+    runs = instance.get_runs(
+        filters=dg.RunsFilter(
+            job_name=job_name,
+            statuses=[
+                dg.DagsterRunStatus.QUEUED,
+                dg.DagsterRunStatus.STARTING,
+                dg.DagsterRunStatus.STARTED,
+                dg.DagsterRunStatus.NOT_STARTED,
+            ],
+            tags={"dagster/partition": partition_keys},
+        ),
+    )
+    return {
+        run.tags["dagster/partition"] for run in runs if "dagster/partition" in run.tags
+    }
+
+
+def partitions_run_since(
+    instance: dg.DagsterInstance,
+    job_name: str,
+    modified: dict[date, datetime],
+) -> set[date]:
+    """Partitions that have had a run created since their files were last modified.
+
+    Those runs have already read, or will read, the files. For example when
+    the runs were requested from S3 event notifications by another sensor.
+    """
+    if not modified:
+        return set()
+
+    records = instance.get_run_records(
+        filters=dg.RunsFilter(
+            job_name=job_name,
+            statuses=[
+                dg.DagsterRunStatus.QUEUED,
+                dg.DagsterRunStatus.STARTING,
+                dg.DagsterRunStatus.STARTED,
+                dg.DagsterRunStatus.NOT_STARTED,
+                dg.DagsterRunStatus.SUCCESS,
+            ],
+            tags={"dagster/partition": [d.isoformat() for d in modified]},
+            created_after=min(modified.values()),
+        ),
+    )
+
+    run_since = set()
+    for record in records:
+        partition = record.dagster_run.tags.get("dagster/partition")
+        if partition is None:
+            continue
+        partition_date = date.fromisoformat(partition)
+        if (
+            partition_date in modified
+            and record.create_timestamp > modified[partition_date]
+        ):
+            run_since.add(partition_date)
+    return run_since
+
+
+class DatasetKeyWatcher:
+    """Turn new S3 keys into run requests for a dataset's daily job."""
+
+    def __init__(self, dataset: S3TimeseriesDataset):
+        self.dataset = dataset
+        self.job_name = dataset.daily_job_name()
+        self.partitions_def = dataset.daily_partitions_def()
+
+        self.matcher = dataset.config.file_pattern.matcher
+        self.bucket = dataset.config.s3_source.bucket
+        # Listed and notified keys don't start with a slash
+        self.source_prefix = dataset.config.s3_source.prefix.lstrip("/")
+        self.key_prefix = self.source_prefix + self.matcher.literal_prefix
+
+    def start_after(self, state: SensorCursor) -> str | None:
+        """Key to start listing after for the lookback window."""
+        if state.latest_partition is None:
+            return None
+
+        start_after = self.dataset.config.file_pattern.start_after_key(
+            state.latest_partition
+            - timedelta(days=self.dataset.config.sensor_lookback_days),
+        )
+        if start_after is None:
+            return None
+        return self.source_prefix + start_after
+
+    def partition_date(self, key: str) -> date | None:
+        """Partition date of a key, or None if it isn't one of the dataset's files."""
+        return self.matcher.match(key.removeprefix(self.source_prefix))
+
+    def match(self, listed: list[dict]) -> list[tuple[dict, date]]:
+        """Listed objects that are the dataset's files, with their partition dates."""
+        objects = {obj["Key"].removeprefix(self.source_prefix): obj for obj in listed}
+        return [
+            (objects[name], partition_date)
+            for name, partition_date in self.matcher.match_many(objects)
+        ]
+
+    def partition_range(self) -> tuple[date, date]:
+        """First and last partitions of the daily job."""
+        return (
+            self.dataset.config.start_date,
+            date.fromisoformat(self.partitions_def.get_last_partition_key()),
+        )
+
+    def run_requests(
+        self,
+        context: dg.SensorEvaluationContext,
+        state: SensorCursor,
+        new_partitions: dict[date, str],
+    ) -> list[dg.RunRequest]:
+        """Run requests for partitions with new files that aren't already running.
+
+        `new_partitions` maps partition dates to a version of their files,
+        which makes the run key unique. Partitions are held in the cursor
+        state until the dataset's run coalescing policy says they are due,
+        and while a run for them is in flight.
+        """
+        policy = self.dataset.config.run_coalescing
+        now = datetime.now(UTC)
+
+        for partition_date, version in new_partitions.items():
+            state.add_pending(partition_date, version, now)
+        waiting = dict(state.pending)
+        due = state.pop_due(policy, now)
+
+        in_flight = in_flight_partitions(
+            context.instance,
+            self.job_name,
+            [partition_date.isoformat() for partition_date in due],
+        )
+        first_partition, last_partition = self.partition_range()
+
+        run_requests = []
+        requested = []
+        for partition_date, version in due.items():
+            dt = partition_date.isoformat()
+            if dt in in_flight:
+                # Files may have landed after the running job listed them,
+                # so request the partition again once the run finishes
+                state.pending[partition_date] = waiting[partition_date]
+                continue
+
+            if first_partition <= partition_date <= last_partition:
+                requested.append(partition_date)
+                run_requests.append(
+                    dg.RunRequest(
+                        run_key=f"{self.dataset.safe_slug}_{dt}_{version}",
+                        job_name=self.job_name,
+                        partition_key=dt,
+                    ),
+                )
+            else:
+                context.log.info(
+                    f"Skipping {self.dataset.safe_slug} partition {dt} "
+                    "as it is not a known partition",
+                )
+
+        state.record_runs(requested, policy, now)
+
+        return run_requests
+
+    def advance(
+        self,
+        state: SensorCursor,
+        matched: list[tuple[dict, date]],
+    ) -> SensorCursor:
+        """Cursor state after the matched objects have been seen."""
+        latest_modified = max(
+            filter(
+                None,
+                [state.last_modified, *(obj["LastModified"] for obj, _ in matched)],
+            ),
+            default=None,
+        )
+        latest_partition = max(
+            filter(None, [state.latest_partition, *(d for _, d in matched)]),
+            default=None,
+        )
+        if latest_partition is not None:
+            # Keep misnamed or future dated files from moving the listing window
+            # past the files of known partitions
+            first_partition, last_partition = self.partition_range()
+            latest_partition = min(
+                max(latest_partition, first_partition),
+                last_partition,
+            )
+        next_state = SensorCursor(
+            last_modified=latest_modified,
+            latest_partition=latest_partition,
+            pending=state.pending,
+            recent_runs=state.recent_runs,
+        )
+
+        # Only index keys that will be listed again next evaluation
+        next_start_after = self.start_after(next_state)
+        if next_start_after is not None:
+            next_state.etags = {
+                obj["Key"]: obj["ETag"]
+                for obj, _ in matched
+                if obj["Key"] > next_start_after
+            }
+
+        return next_state
+
+    def evaluate(
+        self,
+        context: dg.SensorEvaluationContext,
+        state: SensorCursor,
+        matched: list[tuple[dict, date]],
+    ) -> tuple[list[dg.RunRequest], SensorCursor]:
+        """Run requests for new or rewritten files, and the next cursor state.
+
+        Partitions that have already had a run since their files were
+        modified are skipped, so that files which were notified through SQS
+        aren't run again when the bucket is listed to reconcile.
+        """
+        modified = {}
+        for obj, partition_date in matched:
+            if state.is_new(obj):
+                modified[partition_date] = max(
+                    obj["LastModified"],
+                    modified.get(partition_date, obj["LastModified"]),
+                )
+
+        already_run = partitions_run_since(context.instance, self.job_name, modified)
+        new_partitions = {
+            partition_date: last_modified.isoformat()
+            for partition_date, last_modified in modified.items()
+            if partition_date not in already_run
+        }
+
+        next_state = self.advance(state, matched)
+        return self.run_requests(context, next_state, new_partitions), next_state
+
+    def has_run(self, instance: dg.DagsterInstance) -> bool:
+        """Has the dataset's daily job already been run."""
+        return bool(
+            instance.get_runs(filters=dg.RunsFilter(job_name=self.job_name), limit=1),
+        )
+
+
+def list_bucket_matches(
+    client,
+    bucket: str,
+    watchers: list[DatasetKeyWatcher],
+    states: dict[str, SensorCursor],
+) -> dict[str, list[tuple[dict, date]]] | None:
+    """List each prefix in a bucket once, and match keys to the watchers' datasets.
+
+    Returns None if nothing was listed.
+    """
+    index = PatternIndex()
+    list_groups: dict[str, list[DatasetKeyWatcher]] = {}
+    for watcher in watchers:
+        index.add(watcher.key_prefix, watcher)
+        list_groups.setdefault(watcher.key_prefix, []).append(watcher)
+
+    matched = {watcher.dataset.safe_slug: [] for watcher in watchers}
+    seen_keys = set()
+
+    for prefix, group in list_groups.items():
+        start_afters = [
+            watcher.start_after(states[watcher.dataset.safe_slug]) for watcher in group
+        ]
+        start_after = None if None in start_afters else min(start_afters)
+
+        for obj in list_objects(client, bucket, prefix, start_after):
+            if obj["Key"] in seen_keys:
+                continue
+            seen_keys.add(obj["Key"])
+
+            for watcher in index.candidates(obj["Key"]):
+                partition_date = watcher.partition_date(obj["Key"])
+                if partition_date is not None:
+                    matched[watcher.dataset.safe_slug].append((obj, partition_date))
+
+    if not seen_keys:
+        return None
+    return matched
+
+
+def bucket_sensor(
+    bucket: str,
+    watchers: list[DatasetKeyWatcher],
+    jobs: list,
+    minimum_interval_seconds: int = 5 * 60,
+) -> dg.SensorDefinition:
+    """Sensor that lists a bucket once per tick for all of the datasets in it.
+
+    Datasets without any state in the cursor, whose daily job has already
+    been run (by an earlier per dataset sensor), have their listing recorded
+    without requesting runs, rather than backfilling every listed partition.
+    """
+    sensor_name = re.sub(r"\W+", "_", bucket) + "_bucket_s3_sensor"
+
+    @dg.sensor(
+        jobs=jobs,
+        name=sensor_name,
+        minimum_interval_seconds=minimum_interval_seconds,
+    )
+    def s3_bucket_sensor(
+        context: dg.SensorEvaluationContext,
+        s3_credentials: S3Credentials,
+    ):
+        """Sensor to detect new files for all datasets in an S3 bucket."""
+        with sentry_sdk.start_transaction(
+            op=f"{sensor_name}",
+            name=f"S3 Sensor for {bucket}",
+        ):
+            cursor = BucketSensorCursor.from_cursor(context.cursor)
+            states = {
+                watcher.dataset.safe_slug: cursor.datasets.get(
+                    watcher.dataset.safe_slug,
+                    SensorCursor(),
+                )
+                for watcher in watchers
+            }
+
+            client = boto3.client(
+                "s3",
+                aws_access_key_id=s3_credentials.access_key_id,
+                aws_secret_access_key=s3_credentials.secret_access_key,
+            )
+
+            matched = list_bucket_matches(client, bucket, watchers, states)
+            if matched is None:
+                return dg.SkipReason(f"No files found in {bucket}.")
+
+            for watcher in watchers:
+                slug = watcher.dataset.safe_slug
+                if slug not in cursor.datasets and watcher.has_run(context.instance):
+                    context.log.info(
+                        f"Seeding the cursor for {slug} without requesting runs",
+                    )
+                    states[slug] = watcher.advance(states[slug], matched[slug])
+                    continue
+
+                run_requests, states[slug] = watcher.evaluate(
+                    context,
+                    states[slug],
+                    matched[slug],
+                )
+                yield from run_requests
+
+            context.update_cursor(
+                BucketSensorCursor(datasets=states).to_cursor(),
+            )
+
+    return s3_bucket_sensor
+
+
+def receive_notifications(
+    client,
+    queue_url: str,
+    watchers: list[DatasetKeyWatcher],
+    max_receives: int,
+    log: logging.Logger,
+) -> tuple[dict[str, dict[date, str]], list[str]]:
+    """Receive S3 event notifications from SQS.
+
+    Returns the latest sequencer for each notified partition by dataset slug,
+    and the receipt handles of the received messages.
+    """
+    index = PatternIndex()
+    for watcher in watchers:
+        index.add(watcher.key_prefix, watcher)
+
+    notified = {watcher.dataset.safe_slug: {} for watcher in watchers}
+    receipt_handles = []
+
+    for _ in range(max_receives):
+        messages = client.receive_message(
+            QueueUrl=queue_url,
+            MaxNumberOfMessages=10,
+            WaitTimeSeconds=0,
+        ).get("Messages", [])
+        if not messages:
+            break
+
+        for message in messages:
+            receipt_handles.append(message["ReceiptHandle"])
+            try:
+                records = list(s3_event_records(message["Body"]))
+            except (ValueError, KeyError) as e:
+                log.warning(f"Skipping unreadable notification: {e}")
+                continue
+
+            for record in records:
+                for watcher in index.candidates(record["Key"]):
+                    if record["Bucket"] != watcher.bucket:
+                        continue
+                    partition_date = watcher.partition_date(record["Key"])
+                    if partition_date is None:
+                        continue
+
+                    partitions = notified[watcher.dataset.safe_slug]
+                    partitions[partition_date] = later_sequencer(
+                        partitions.get(partition_date),
+                        record["Sequencer"],
+                    )
+
+    return notified, receipt_handles
+
+
+def delete_messages(
+    client,
+    queue_url: str,
+    receipt_handles: list[str],
+    log: logging.Logger,
+) -> None:
+    """Delete handled messages from SQS.
+
+    Failures are only logged, as messages that are delivered again
+    have the same run keys, and are deduplicated by Dagster.
+    """
+    for start in range(0, len(receipt_handles), 10):
+        try:
+            client.delete_message_batch(
+                QueueUrl=queue_url,
+                Entries=[
+                    {"Id": str(i), "ReceiptHandle": handle}
+                    for i, handle in enumerate(receipt_handles[start : start + 10])
+                ],
+            )
+        except ClientError as e:
+            log.warning(f"Could not delete notifications from {queue_url}: {e}")
+
+
+def queue_sensor(
+    queue_url: str,
+    watchers: list[DatasetKeyWatcher],
+    jobs: list,
+    max_receives: int = 10,
+) -> dg.SensorDefinition:
+    """Sensor that turns S3 ObjectCreated notifications from SQS into run requests.
+
+    Notifications for the same partition are coalesced into a single run,
+    and redelivered notifications have the same run key so they are
+    deduplicated by Dagster. Messages are only deleted after the run
+    requests have been yielded and the cursor updated.
+    """
+    queue_name = queue_url.rstrip("/").rsplit("/", 1)[-1]
+    sensor_name = re.sub(r"\W+", "_", queue_name) + "_sqs_sensor"
+
+    @dg.sensor(
+        jobs=jobs,
+        name=sensor_name,
+        minimum_interval_seconds=30,
+    )
+    def s3_queue_sensor(
+        context: dg.SensorEvaluationContext,
+        s3_credentials: S3Credentials,
+    ):
+        """Sensor to trigger updates from S3 event notifications."""
+        with sentry_sdk.start_transaction(
+            op=sensor_name,
+            name=f"SQS Sensor for {queue_name}",
+        ):
+            client = boto3.client(
+                "sqs",
+                region_name=queue_region(queue_url),
+                aws_access_key_id=s3_credentials.access_key_id,
+                aws_secret_access_key=s3_credentials.secret_access_key,
+            )
+
+            notified, receipt_handles = receive_notifications(
+                client,
+                queue_url,
+                watchers,
+                max_receives,
+                context.log,
+            )
+
+            cursor = BucketSensorCursor.from_cursor(context.cursor)
+            states = {
+                watcher.dataset.safe_slug: cursor.datasets.get(
+                    watcher.dataset.safe_slug,
+                    SensorCursor(),
+                )
+                for watcher in watchers
+            }
+            if not receipt_handles and not any(
+                state.pending for state in states.values()
+            ):
+                return dg.SkipReason(f"No notifications in {queue_name}.")
+
+            for watcher in watchers:
+                slug = watcher.dataset.safe_slug
+                yield from watcher.run_requests(
+                    context,
+                    states[slug],
+                    {
+                        partition_date: f"sqs_{sequencer}"
+                        for partition_date, sequencer in notified[slug].items()
+                    },
+                )
+
+            context.update_cursor(
+                BucketSensorCursor(datasets=states).to_cursor(),
+            )
+
+            delete_messages(client, queue_url, receipt_handles, context.log)
+
+    return s3_queue_sensor
+
+
+def defs_for_dataset(  # noqa: C901
+    dataset: S3TimeseriesDataset,
+    s3_sensor: bool = True,
+) -> dg.Definitions:
+    """Definitions for a single S3 Timeseries dataset.
+
+    Set `s3_sensor=False` when the dataset's files are watched by a
+    shared `bucket_sensor` instead.
+    """
     common_asset_kwargs = {
         "key_prefix": ["s3_timeseries", dataset.safe_slug],
         "group_name": dataset.safe_slug,
     }
 
-    daily_partitions = dg.DailyPartitionsDefinition(
-        start_date=dataset.config.start_date.isoformat(),
-        end_offset=1,
-    )
+    daily_partitions = dataset.daily_partitions_def()
 
     monthly_partitions = dg.MonthlyPartitionsDefinition(
         start_date=dataset.config.start_date.strftime("%Y-%m-01"),
         end_offset=1,
     )
 
+    source_reader = dataset.config.reader
+    read_columns = None
+    if dataset.config.project_columns:
+        # Attributes from the YAML file may name unmapped source columns
+        dataset.config.attributes.add_attributes_from_yaml()
+        read_columns = dataset.config.source_columns()
+        source_reader = source_reader.with_columns(read_columns)
+
+    converter_plan = mappings.ConverterPlan(
+        dataset.config.variable_converter,
+        read_columns,
+    )
+
+    # Work out how columns are renamed once, and flag mappings that
+    # would give several columns the same name
+    rename_plan = mappings.RenamePlan(dataset.config.variable_mappings)
+    if rename_plan.collisions:
+        message = (
+            f"Variable mappings for {dataset.slug} map several sources to the "
+            f"same output, which will be coalesced: {rename_plan.collisions}"
+        )
+        logging.getLogger(__name__).warning(message)
+        sentry_sdk.capture_message(message, level="warning")
+
+    daily_metadata = {io.DESIRED_PATH: dataset.daily_partition_path()}
+    daily_asset_kwargs = io.CSV_ASSET_KWARGS
+    if dataset.config.daily_format == "parquet":
+        daily_asset_kwargs = io.PARQUET_ASSET_KWARGS
+        if dataset.config.daily_csv_export:
+            daily_metadata[io.CSV_EXPORT_PATH] = dataset.daily_partition_path("csv")
+
     @dg.asset(
         partitions_def=daily_partitions,
-        metadata={io.DESIRED_PATH: dataset.daily_partition_path()},
-        **io.CSV_ASSET_KWARGS,
+        metadata=daily_metadata,
+        **daily_asset_kwargs,
         **common_asset_kwargs,
     )
     @sentry.capture_op_exceptions
-    def daily_df(context: dg.AssetExecutionContext, s3fs: S3FSResource) -> pd.DataFrame:
+    def daily_df(
+        context: dg.AssetExecutionContext,
+        s3fs: S3FSResource,
+        datastore: io.Datastore,
+    ) -> pd.DataFrame:
         """Download daily dataframe from S3."""
         partition_date_string = context.asset_partition_key_for_output()
         partition_date = date.fromisoformat(partition_date_string)
@@ -132,39 +839,64 @@ def defs_for_dataset(dataset: S3TimeseriesDataset) -> dg.Definitions:  # noqa: C
         day_glob = (
             dataset.config.s3_source.bucket
             + dataset.config.s3_source.prefix
-            + dataset.config.file_pattern.day_pattern.format(
-                partition_date=partition_date,
-            )
+            + dataset.config.file_pattern.glob(partition_date)
         )
 
         context.log.info(
             f"Reading daily data for {partition_date_string} from S3 with glob: {day_glob}",
         )
 
-        s3_keys = s3fs.fs.glob(day_glob)
-        s3_keys.sort()
+        s3_infos = s3fs.fs.glob(day_glob, detail=True)
+        s3_keys = sorted(s3_infos)
 
         context.log.info(f"Found {len(s3_keys)} files: \n{s3_keys}")
         context.add_output_metadata({"Source S3 keys": dg.MetadataValue.json(s3_keys)})
 
-        daily_dfs = []
-
-        for day_f in s3_keys:
-            context.log.debug(f"Reading {day_f}")
-            with s3fs.fs.open(day_f, "rb") as f:
-                df = dataset.config.reader.read_df(f)
+        if dataset.config.incremental_reads:
+            # Only fetch and parse what has been appended since the last run
+            incremental_reader = IncrementalCSVReader(
+                source_reader,
+                s3fs.fs,
+                datastore.scratch_path() / "incremental_reads" / dataset.safe_slug,
+                batch_size=s3fs.max_concurrency,
+            )
+            source_dfs = incremental_reader.read(
+                {key: s3_infos[key] for key in s3_keys}
+            )
+            context.add_output_metadata(
+                {"Incremental reads": dg.MetadataValue.json(incremental_reader.stats)},
+            )
+        else:
+            # Fetch all of the day's objects concurrently, but keep parsing
+            # in sorted key order so the output is deterministic.
+            cache_before = s3fs.cache_stats()
+            contents = s3fs.cat_objects(s3_keys, s3_infos)
+            context.add_output_metadata(
+                {
+                    f"S3 cache {name}": dg.MetadataValue.int(count - cache_before[name])
+                    for name, count in s3fs.cache_stats().items()
+                },
+            )
+            source_dfs = {
+                key: source_reader.read_df(BytesIO(contents[key])) for key in s3_keys
+            }
 
-                if dataset.config.variable_converter is not None:
-                    for converter in dataset.config.variable_converter:
-                        df = converter.convert(df)
+        if dataset.config.convert_after_concat:
+            df = converter_plan.run(pd.concat([source_dfs[key] for key in s3_keys]))
+        else:
+            daily_dfs = []
 
-                daily_dfs.append(df)
+            for day_f in s3_keys:
+                context.log.debug(f"Converting {day_f}")
+                daily_dfs.append(converter_plan.run(source_dfs[day_f]))
 
-        df = pd.concat(daily_dfs)
+            df = pd.concat(daily_dfs)
 
-        df[dataset.config.source_time_var] = pd.to_datetime(
-            df[dataset.config.source_time_var],
-        )
+        # The reader may have already parsed times
+        if not pd.api.types.is_datetime64_any_dtype(df[dataset.config.source_time_var]):
+            df[dataset.config.source_time_var] = pd.to_datetime(
+                df[dataset.config.source_time_var],
+            )
         if dataset.config.dataset_type == "profile":
             indx_var = [dataset.config.source_time_var, "depth"]
         else:
@@ -174,21 +906,31 @@ def defs_for_dataset(dataset: S3TimeseriesDataset) -> dg.Definitions:  # noqa: C
 
         return df
 
+    daily_input_metadata = {io.ALLOW_MISSING_PARTITIONS: True}
+    monthly_metadata = {
+        io.DESIRED_PATH: dataset.monthly_partition_path(),
+        io.NC_ENCODING: dataset.config.nc_encoding.model_dump(),
+        # io.S3_DESIRED_PATH: config.s3_path(),
+        # io.S3_PUBLIC: True,
+    }
+    if dataset.config.incremental_monthly:
+        daily_input_metadata[io.INCREMENTAL_TARGET_PATH] = (
+            dataset.monthly_partition_path()
+        )
+        monthly_metadata[io.APPEND_DIM] = "time"
+
     @dg.asset(
         ins={
             "daily_df": dg.AssetIn(
                 partition_mapping=dg.TimeWindowPartitionMapping(
                     allow_nonexistent_upstream_partitions=True,
                 ),
-                metadata={io.ALLOW_MISSING_PARTITIONS: True},
+                metadata=daily_input_metadata,
+                dagster_type=io.LAZY_PARTITIONS_TYPE,
             ),
         },
         partitions_def=monthly_partitions,
-        metadata={
-            io.DESIRED_PATH: dataset.monthly_partition_path(),
-            # io.S3_DESIRED_PATH: config.s3_path(),
-            # io.S3_PUBLIC: True,
-        },
+        metadata=monthly_metadata,
         automation_condition=assets.auto_condition_eager_allow_missing(),
         **io.NETCDF_ASSET_KWARGS,
         **common_asset_kwargs,
@@ -196,55 +938,62 @@ def defs_for_dataset(dataset: S3TimeseriesDataset) -> dg.Definitions:  # noqa: C
     @sentry.capture_op_exceptions
     def monthly_ds(
         context: dg.AssetExecutionContext,
-        daily_df: dict[str, pd.DataFrame],
+        daily_df: Mapping[str, pd.DataFrame],
     ) -> xr.Dataset:
         """Combine daily dataframes into a monthly NetCDF and apply transformations."""
 
+        # The numeric schema is inferred once per run, and reused for
+        # every daily dataframe after that. Avoid attempting to convert the
+        # time column to numeric, which causes unnecessary exceptions.
+        numeric_coercer = NumericCoercer(na_values=["NAN"], ignore_columns=["time"])
+
         daily_dfs = []
 
         for df_date, df in daily_df.items():
-            for var_map in dataset.config.variable_mappings:
-                if var_map.source in df.columns:
-                    df = df.rename(columns={var_map.source: var_map.output})
-                else:
-                    context.log.warning(
-                        f"Source variable '{var_map.source}' not found in data for {df_date}",
-                    )
-
-            if len(set(df.columns)) != len(df.columns):
+            for source in rename_plan.missing_sources(df.columns):
                 context.log.warning(
-                    f"Column name collision after renaming for data on {df_date}, trying to squish duplicates",
+                    f"Source variable '{source}' not found in data for {df_date}",
                 )
-                df = df.groupby(df.columns, axis=1).first()
-
-            # Avoid attempting to convert the time column to numeric inside
-            # clean_up_dtypes_and_nas, which causes unnecessary exceptions.
-            if "time" in df.columns:
-                time_col = df["time"]
-                df_wo_time = df.drop(columns=["time"])
-                df_wo_time = clean_up_dtypes_and_nas(
-                    df_wo_time,
-                    na_values="NAN",
-                    logger=context.log,
+
+            if collisions := rename_plan.collisions_in(df.columns):
+                context.log.warning(
+                    f"Column name collision after renaming for data on {df_date}, "
+                    f"coalescing duplicates: {collisions}",
                 )
-                df_wo_time["time"] = time_col
-                df = df_wo_time
-            else:
-                df = clean_up_dtypes_and_nas(df, na_values="NAN", logger=context.log)
+            df = rename_plan.apply(df)
+
+            df = numeric_coercer.coerce(df)
             daily_dfs.append(df)
 
+        if numeric_coercer.failures:
+            context.log.warning(
+                f"Could not convert columns to numeric: {list(numeric_coercer.failures)}",
+            )
+        context.add_output_metadata(
+            {
+                "Numeric conversion failures": dg.MetadataValue.json(
+                    numeric_coercer.failures,
+                ),
+                "Variable mapping collisions": dg.MetadataValue.json(
+                    rename_plan.collisions,
+                ),
+            },
+        )
+
         df = pd.concat(daily_dfs, ignore_index=True)
+        if not pd.api.types.is_datetime64_any_dtype(df["time"]):
+            df["time"] = pd.to_datetime(df["time"])
+
         if dataset.config.dataset_type == "profile":
-            indx_var = ["time", "depth"]
+            # Scatter onto the (time, depth) grid, rather than
+            # reindexing a MultiIndex onto every time and depth
+            ds = gridding.grid_profile(df, "time", "depth")
         else:
-            indx_var = "time"
-
-        df = df.sort_values(indx_var)
-        df = df.drop_duplicates(subset=indx_var)
-        df["time"] = pd.to_datetime(df["time"])
-        df = df.set_index(indx_var)
+            df = df.sort_values("time")
+            df = df.drop_duplicates(subset="time")
+            df = df.set_index("time")
 
-        ds = df.to_xarray()
+            ds = df.to_xarray()
 
         ds["station"] = dataset.config.station
         if dataset.config.latitude is not None:
@@ -271,96 +1020,62 @@ def defs_for_dataset(dataset: S3TimeseriesDataset) -> dg.Definitions:  # noqa: C
         return ds
 
     daily_job = dg.define_asset_job(
-        f"update_{dataset.safe_slug}_daily",
+        dataset.daily_job_name(),
         selection=[daily_df],
     )
+    key_watcher = DatasetKeyWatcher(dataset)
 
     @dg.sensor(
         job=daily_job,
         name=dataset.safe_slug + "_s3_sensor",
         minimum_interval_seconds=5 * 60,
     )
-    def s3_sensor(context: dg.SensorEvaluationContext, s3_credentials: S3Credentials):
+    def dataset_s3_sensor(
+        context: dg.SensorEvaluationContext,
+        s3_credentials: S3Credentials,
+    ):
         """Sensor to detect new files for a day in S3."""
         with sentry_sdk.start_transaction(
             op=f"{dataset.safe_slug}_s3_sensor",
             name=f"S3 Sensor for {dataset.safe_slug}",
         ):
-            since_time = context.cursor or None
-            if since_time:
-                since_time = datetime.fromisoformat(since_time)
+            state = SensorCursor.from_cursor(context.cursor)
 
             client = boto3.client(
                 "s3",
                 aws_access_key_id=s3_credentials.access_key_id,
                 aws_secret_access_key=s3_credentials.secret_access_key,
             )
-            file_start = dataset.config.file_pattern.day_pattern.split("{")[0]
 
-            new_s3_keys = get_objects(
-                bucket=dataset.config.s3_source.bucket,
-                prefix=file_start,
-                since_last_modified=since_time,
-                client=client,
+            # Only list keys from the lookback window onwards,
+            # rather than every key under the prefix
+            listed = list(
+                list_objects(
+                    client,
+                    bucket=dataset.config.s3_source.bucket,
+                    prefix=key_watcher.key_prefix,
+                    start_after=key_watcher.start_after(state),
+                ),
             )
-            if not new_s3_keys:
+            if not listed:
                 return dg.SkipReason("No new files found in S3.")
 
-            existing_partitions = set()
-            known_partitions = set(daily_partitions.get_partition_keys())
-            for run in context.instance.get_runs(
-                filters=dg.RunsFilter(
-                    job_name=daily_job.name,
-                    statuses=[
-                        dg.DagsterRunStatus.QUEUED,
-                        dg.DagsterRunStatus.STARTING,
-                        dg.DagsterRunStatus.STARTED,
-                        dg.DagsterRunStatus.NOT_STARTED,
-                    ],
-                ),
-            ):
-                try:
-                    existing_partitions.add(run.tags["dagster/partition"])
-                except KeyError:
-                    pass
-
-            for key in new_s3_keys:
-                object_key = key.get("Key")
-
-                object_name = object_key.removeprefix(dataset.config.s3_source.prefix)
-                name_pattern = dataset.config.file_pattern.day_pattern.replace(
-                    "*",
-                    "{}",
-                )
-                result = parse(name_pattern, object_name)
-                dt = result.named["partition_date"].strftime("%Y-%m-%d")
-
-                if dt not in existing_partitions:
-                    last_modified = key.get("LastModified")
-
-                    if since_time is None or last_modified > since_time:
-                        existing_partitions.add(dt)
-                        run_key = f"{dt}_{last_modified.isoformat()}"
-
-                        if dt in known_partitions:
-                            yield dg.RunRequest(
-                                run_key=run_key,
-                                partition_key=dt,
-                            )
-                        else:
-                            context.log.info(
-                                f"Skipping partition {dt} as it is not a known partition",
-                            )
+            run_requests, next_state = key_watcher.evaluate(
+                context,
+                state,
+                key_watcher.match(listed),
+            )
+            yield from run_requests
 
-            latest_key_dt = max(key.get("LastModified") for key in new_s3_keys)
-            context.update_cursor(latest_key_dt.isoformat())
+            context.update_cursor(next_state.to_cursor())
 
     dataset_assets = [daily_df, monthly_ds]
 
     return dg.Definitions(
         assets=dataset_assets,
+        jobs=[daily_job],
         sensors=[
-            s3_sensor,
+            *([dataset_s3_sensor] if s3_sensor else []),
             dg.AutomationConditionSensorDefinition(
                 dataset.safe_slug + "_automation_sensor",
                 target=dataset_assets,
@@ -399,6 +1114,7 @@ def build_defs() -> dg.Definitions:
                 "s3fs": S3FSResource(
                     credentials=credentials,
                     region_name="us-east-1",
+                    cache_path=str(datastore.scratch_path() / "s3_cache"),
                 ),
                 "datastore": datastore,
                 **io_managers,
@@ -406,10 +1122,57 @@ def build_defs() -> dg.Definitions:
         )
 
         datasets = api_client.datasets_for_pipeline(pipeline.slug, S3TimeseriesDataset)
+
+        # Datasets are watched by a sensor per bucket,
+        # so that shared buckets are only listed once a tick
+        watchers_by_bucket: dict[str, list[DatasetKeyWatcher]] = {}
+        watchers_by_queue: dict[str, list[DatasetKeyWatcher]] = {}
+        jobs_by_watcher: dict[str, list] = {}
+
         for dataset in datasets:
-            dataset_defs = defs_for_dataset(dataset)
+            dataset_defs = defs_for_dataset(dataset, s3_sensor=False)
             defs = dg.Definitions.merge(defs, dataset_defs)
 
+            watcher = DatasetKeyWatcher(dataset)
+            jobs_by_watcher[dataset.safe_slug] = list(dataset_defs.jobs)
+
+            s3_source_config = dataset.config.s3_source
+            watchers_by_bucket.setdefault(s3_source_config.bucket, []).append(watcher)
+            if s3_source_config.notification_queue_url:
+                watchers_by_queue.setdefault(
+                    s3_source_config.notification_queue_url,
+                    [],
+                ).append(watcher)
+
+        def watcher_jobs(watchers: list[DatasetKeyWatcher]) -> list:
+            return [
+                job
+                for watcher in watchers
+                for job in jobs_by_watcher[watcher.dataset.safe_slug]
+            ]
+
+        sensors = []
+        for queue_url, watchers in watchers_by_queue.items():
+            sensors.append(queue_sensor(queue_url, watchers, watcher_jobs(watchers)))
+
+        for bucket, watchers in watchers_by_bucket.items():
+            # With notifications, polling is only a fallback to reconcile
+            # any files that were missed
+            notified = all(
+                watcher.dataset.config.s3_source.notification_queue_url
+                for watcher in watchers
+            )
+            sensors.append(
+                bucket_sensor(
+                    bucket,
+                    watchers,
+                    watcher_jobs(watchers),
+                    minimum_interval_seconds=60 * 60 if notified else 5 * 60,
+                ),
+            )
+
+        defs = dg.Definitions.merge(defs, dg.Definitions(sensors=sensors))
+
         return defs
 
 
@@ -419,17 +1182,15 @@ def clean_up_dtypes_and_nas(
     logger: logging.Logger | None = None,
 ) -> pd.DataFrame:
     """Clean up data types and NA values in a dataframe"""
-    df = df.copy()
     if not logger:
         logger = logging.getLogger(__name__)
-    if na_values is not None:
-        df = df.replace(na_values, pd.NA).dropna()
+    if isinstance(na_values, str):
+        na_values = [na_values]
 
-    for c in df.columns:
-        try:
-            df[c] = pd.to_numeric(df[c])
-        except (ValueError, TypeError) as e:
-            if logger:
-                logger.warning(f"Could not convert column {c} to numeric: {e}")
+    coercer = NumericCoercer(na_values=na_values)
+    df = coercer.coerce(df)
+
+    for c, e in coercer.failures.items():
+        logger.warning(f"Could not convert column {c} to numeric: {e}")
 
     return df
@@ -0,0 +1,384 @@
+"""Incremental listing of S3 objects for sensors"""
+
+import json
+import re
+from collections.abc import Iterable, Iterator
+from datetime import UTC, date, datetime, timedelta
+from typing import Annotated
+from urllib.parse import unquote_plus, urlparse
+
+from pydantic import BaseModel, Field
+
+
+class RunCoalescing(BaseModel):
+    """When to request runs for partitions that keep receiving files.
+
+    The defaults request a run as soon as a new file is found.
+    """
+
+    quiet_period_minutes: Annotated[
+        float,
+        Field(
+            description="Wait until a partition has had no new files for this long",
+            ge=0,
+        ),
+    ] = 0
+    max_delay_minutes: Annotated[
+        float | None,
+        Field(
+            description=(
+                "Request a run anyway once a partition has been waiting this long, "
+                "even if files are still arriving"
+            ),
+            ge=0,
+        ),
+    ] = None
+    max_runs_per_hour: Annotated[
+        int | None,
+        Field(description="Most runs to request for a partition in an hour", ge=1),
+    ] = None
+
+    def is_due(
+        self,
+        pending: "PendingPartition",
+        recent_runs: list[datetime],
+        now: datetime,
+    ) -> bool:
+        """Should a run be requested for the pending partition now"""
+        if self.max_runs_per_hour is not None:
+            runs_last_hour = [t for t in recent_runs if now - t < timedelta(hours=1)]
+            if len(runs_last_hour) >= self.max_runs_per_hour:
+                return False
+
+        if now - pending.last_seen >= timedelta(minutes=self.quiet_period_minutes):
+            return True
+
+        return self.max_delay_minutes is not None and (
+            now - pending.first_seen >= timedelta(minutes=self.max_delay_minutes)
+        )
+
+
+class PendingPartition(BaseModel):
+    """A partition with new files that hasn't had a run requested yet"""
+
+    first_seen: datetime
+    last_seen: datetime
+    version: Annotated[
+        str,
+        Field(description="Version of the latest files, used in the run key"),
+    ]
+
+
+class SensorCursor(BaseModel):
+    """State kept between S3 sensor evaluations"""
+
+    last_modified: Annotated[
+        datetime | None,
+        Field(description="Most recent LastModified time of a listed object"),
+    ] = None
+    latest_partition: Annotated[
+        date | None,
+        Field(description="Most recent partition date of a listed object"),
+    ] = None
+    etags: Annotated[
+        dict[str, str],
+        Field(
+            description="ETags of the keys in the current listing window",
+            default_factory=dict,
+        ),
+    ]
+    pending: Annotated[
+        dict[date, PendingPartition],
+        Field(
+            description="Partitions waiting for a run to be requested",
+            default_factory=dict,
+        ),
+    ]
+    recent_runs: Annotated[
+        dict[date, list[datetime]],
+        Field(
+            description="When runs were requested for partitions in the last hour",
+            default_factory=dict,
+        ),
+    ]
+
+    @classmethod
+    def from_cursor(cls, cursor: str | None) -> "SensorCursor":
+        """Load state from a sensor cursor"""
+        if not cursor:
+            return cls()
+
+        if cursor.startswith("{"):
+            return cls.model_validate_json(cursor)
+
+        # Older cursors only stored the most recent LastModified time
+        last_modified = datetime.fromisoformat(cursor)
+        return cls(last_modified=last_modified, latest_partition=last_modified.date())
+
+    def to_cursor(self) -> str:
+        """Serialize state for a sensor cursor"""
+        return self.model_dump_json()
+
+    def is_new(self, obj: dict) -> bool:
+        """Has the object been added or rewritten since the last evaluation"""
+        key = obj["Key"]
+        etag = obj["ETag"]
+
+        if key in self.etags:
+            return self.etags[key] != etag
+
+        return self.last_modified is None or obj["LastModified"] > self.last_modified
+
+    def add_pending(self, partition_date: date, version: str, now: datetime) -> None:
+        """Record new files for a partition"""
+        pending = self.pending.get(partition_date)
+        self.pending[partition_date] = PendingPartition(
+            first_seen=pending.first_seen if pending else now,
+            last_seen=now,
+            version=version,
+        )
+
+    def pop_due(
+        self,
+        policy: RunCoalescing,
+        now: datetime | None = None,
+    ) -> dict[date, str]:
+        """Remove and return the pending partitions that are due a run, with versions"""
+        now = now or datetime.now(UTC)
+
+        due = {}
+        for partition_date, pending in list(self.pending.items()):
+            if policy.is_due(pending, self.recent_runs.get(partition_date, []), now):
+                due[partition_date] = pending.version
+                del self.pending[partition_date]
+
+        return due
+
+    def record_runs(
+        self,
+        partition_dates: Iterable[date],
+        policy: RunCoalescing,
+        now: datetime | None = None,
+    ) -> None:
+        """Record requested runs, if the policy limits how often they happen"""
+        if policy.max_runs_per_hour is None:
+            self.recent_runs = {}
+            return
+
+        now = now or datetime.now(UTC)
+        for partition_date in partition_dates:
+            self.recent_runs.setdefault(partition_date, []).append(now)
+
+        self.recent_runs = {
+            partition_date: recent
+            for partition_date, runs in self.recent_runs.items()
+            if (recent := [t for t in runs if now - t < timedelta(hours=1)])
+        }
+
+
+def list_objects(
+    client,
+    bucket: str,
+    prefix: str,
+    start_after: str | None = None,
+) -> Iterator[dict]:
+    """List objects under prefix, optionally only those with keys after `start_after`"""
+    kwargs = {"Bucket": bucket, "Prefix": prefix}
+    if start_after:
+        kwargs["StartAfter"] = start_after
+
+    paginator = client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(**kwargs):
+        yield from page.get("Contents", [])
+
+
+def s3_event_records(body: str) -> Iterator[dict]:
+    """ObjectCreated records from an S3 event notification message body.
+
+    Notifications delivered through SNS are unwrapped first.
+    Raises ValueError if the body isn't JSON.
+    """
+    message = json.loads(body)
+    if "Records" not in message and "Message" in message:
+        message = json.loads(message["Message"])
+
+    for record in message.get("Records", []):
+        if not record.get("eventName", "").startswith("ObjectCreated"):
+            continue
+
+        s3 = record["s3"]
+        yield {
+            "Bucket": s3["bucket"]["name"],
+            # Keys are URL encoded in notifications
+            "Key": unquote_plus(s3["object"]["key"]),
+            "Sequencer": s3["object"].get("sequencer") or record.get("eventTime"),
+        }
+
+
+def queue_region(queue_url: str) -> str:
+    """AWS region from an SQS queue URL"""
+    host = urlparse(queue_url).hostname or ""
+    parts = host.split(".")
+    if len(parts) > 2 and parts[0] == "sqs":
+        return parts[1]
+    return "us-east-1"
+
+
+def later_sequencer(a: str | None, b: str) -> str:
+    """The later of two S3 event sequencers.
+
+    Sequencers are hex strings that can only be compared
+    once padded to the same length.
+    """
+    if a is None:
+        return b
+    width = max(len(a), len(b))
+    return max(a, b, key=lambda sequencer: sequencer.rjust(width, "0"))
+
+
+class BucketSensorCursor(BaseModel):
+    """State kept between bucket sensor evaluations, for each dataset"""
+
+    datasets: Annotated[
+        dict[str, SensorCursor],
+        Field(
+            description="Sensor state by dataset slug",
+            default_factory=dict,
+        ),
+    ]
+
+    @classmethod
+    def from_cursor(cls, cursor: str | None) -> "BucketSensorCursor":
+        """Load state from a sensor cursor"""
+        if not cursor:
+            return cls()
+        return cls.model_validate_json(cursor)
+
+    def to_cursor(self) -> str:
+        """Serialize state for a sensor cursor"""
+        return self.model_dump_json()
+
+
+class PatternIndex[T]:
+    """Look up targets by the literal prefix of the keys they match.
+
+    Keys are only checked against the full patterns of the targets
+    whose prefix they start with.
+    """
+
+    def __init__(self):
+        self._by_prefix: dict[str, list[T]] = {}
+
+    def add(self, prefix: str, target: T) -> None:
+        """Add a target for keys starting with prefix"""
+        self._by_prefix.setdefault(prefix, []).append(target)
+
+    def candidates(self, key: str) -> list[T]:
+        """Targets whose prefix the key starts with"""
+        return [
+            target
+            for prefix, targets in self._by_prefix.items()
+            if key.startswith(prefix)
+            for target in targets
+        ]
+
+
+# Regexes for the strftime directives supported in day patterns
+DATE_DIRECTIVES = {
+    "Y": r"(?P<Y>\d{4})",
+    "y": r"(?P<y>\d{2})",
+    "m": r"(?P<m>\d{2})",
+    "d": r"(?P<d>\d{2})",
+    "j": r"(?P<j>\d{3})",
+    "H": r"\d{2}",
+    "M": r"\d{2}",
+    "S": r"\d{2}",
+    "%": "%",
+}
+
+
+class DayPatternMatcher:
+    """Match file names against a day pattern like `EW01_met_{partition_date:%Y%m%d}_*.txt`.
+
+    The pattern is compiled once into an anchored regex. `*` and `?` match
+    within a path segment as they do for S3 globs.
+    """
+
+    def __init__(self, day_pattern: str):
+        self.day_pattern = day_pattern
+
+        regex = []
+        # Date parts that have already been captured, so that repeats
+        # refer back to them rather than redefining the group
+        captured: set[str] = set()
+        for part in re.split(r"(\{partition_date:[^}]*\}|\*|\?)", day_pattern):
+            if part == "*":
+                regex.append(r"[^/]*")
+            elif part == "?":
+                regex.append(r"[^/]")
+            elif part.startswith("{partition_date:"):
+                date_format = part[len("{partition_date:") : -1]
+                regex.append(date_format_regex(date_format, captured))
+            else:
+                regex.append(re.escape(part))
+
+        self.regex = re.compile("".join(regex))
+        self.literal_prefix = re.split(r"[{*?\[]", day_pattern, maxsplit=1)[0]
+
+    def match(self, name: str) -> date | None:
+        """Partition date of a file name, or None if it doesn't match"""
+        if not name.startswith(self.literal_prefix):
+            return None
+
+        result = self.regex.fullmatch(name)
+        if result is None:
+            return None
+
+        parts = result.groupdict()
+        try:
+            if parts.get("Y"):
+                year = int(parts["Y"])
+            else:
+                year = datetime.strptime(parts["y"], "%y").year
+
+            if parts.get("j"):
+                return date(year, 1, 1) + timedelta(days=int(parts["j"]) - 1)
+            return date(year, int(parts["m"]), int(parts["d"]))
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def match_many(self, names: Iterable[str]) -> Iterator[tuple[str, date]]:
+        """File names that match, with their partition dates"""
+        for name in names:
+            partition_date = self.match(name)
+            if partition_date is not None:
+                yield name, partition_date
+
+    def glob(self, partition_date: date) -> str:
+        """Glob for a partition date's files"""
+        return self.day_pattern.format(partition_date=partition_date)
+
+
+def date_format_regex(date_format: str, captured: set[str] | None = None) -> str:
+    """Regex for a strftime format, capturing the date parts.
+
+    Date parts in `captured` have been captured earlier in the pattern,
+    so they are matched with a backreference. Newly captured parts are added.
+    """
+    if captured is None:
+        captured = set()
+
+    regex = []
+    for literal, directive in re.findall(r"([^%]*)(?:%(.))?", date_format):
+        regex.append(re.escape(literal))
+        if not directive:
+            continue
+        if directive not in DATE_DIRECTIVES:
+            raise ValueError(f"Unsupported date directive %{directive} in day pattern")
+        if directive in captured:
+            regex.append(f"(?P={directive})")
+            continue
+        if DATE_DIRECTIVES[directive].startswith("(?P<"):
+            captured.add(directive)
+        regex.append(DATE_DIRECTIVES[directive])
+    return "".join(regex)
@@ -4,6 +4,7 @@ import boto3
 import pytest
 from moto import mock_aws
 
+from common.io.datastore import Datastore
 from common.resource.s3fs_resource import S3Credentials, S3FSResource
 
 
@@ -51,3 +52,8 @@ def s3_resource(s3_credentials):
 def mocked_s3():
     with mock_aws():
         yield boto3.client("s3", region_name="us-east-1")
+
+
+@pytest.fixture
+def datastore(tmp_path):
+    return Datastore(path_stub="s3_timeseries", test_path=str(tmp_path))
@@ -50,7 +50,7 @@ def test_sensor(defs, mocked_s3, s3_credentials):
 
 
 @pytest.mark.aws
-def test_daily_asset(defs, dataset_config, s3_resource):
+def test_daily_asset(defs, dataset_config, s3_resource, datastore):
     daily_df = test_utils.get_asset_by_name(defs, "daily_df")
     spec = daily_df.get_asset_spec()
 
@@ -61,7 +61,7 @@ def test_daily_asset(defs, dataset_config, s3_resource):
 
     context = dg.build_asset_context(partition_key="2025-02-10")
 
-    df = daily_df(context, s3fs=s3_resource)
+    df = daily_df(context, s3fs=s3_resource, datastore=datastore)
 
     assert isinstance(df, pd.DataFrame)
     assert not df.empty
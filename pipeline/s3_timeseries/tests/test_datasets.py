@@ -176,6 +176,7 @@ def test_daily_asset(
     defs,
     dataset_config,
     s3_resource,
+    datastore,
     asset_name,
     snapshot_path,
     partition_key,
@@ -192,7 +193,7 @@ def test_daily_asset(
 
     context = dg.build_asset_context(partition_key=partition_key)
 
-    df = daily_df(context, s3fs=s3_resource)
+    df = daily_df(context, s3fs=s3_resource, datastore=datastore)
 
     assert isinstance(df, pd.DataFrame)
     assert not df.empty
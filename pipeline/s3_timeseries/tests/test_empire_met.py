@@ -1,12 +1,22 @@
+from datetime import UTC, date, datetime, timedelta
 from pathlib import Path
 
+import boto3
 import dagster as dg
 import pandas as pd
 import pytest
 import xarray as xr
 
 from common import io, test_utils
-from pipeline import S3TimeseriesDataset, defs_for_dataset
+from pipeline import (
+    DatasetKeyWatcher,
+    S3TimeseriesDataset,
+    bucket_sensor,
+    defs_for_dataset,
+    queue_sensor,
+)
+
+from s3_listing import BucketSensorCursor, SensorCursor
 
 TEST_DATA_DIR = Path("/mnt/test-data/s3_timeseries/")
 
@@ -50,8 +60,224 @@ def test_sensor(defs, mocked_s3, s3_credentials):
     # assert context.cursor == "2025-11-12T23:50:56+00:00"
 
 
+def test_bucket_sensor(dataset_config, mocked_s3, s3_credentials):
+    bucket = "ott-empire"
+    mocked_s3.create_bucket(Bucket=bucket)
+    mocked_s3.put_object(Bucket=bucket, Key="EW01_met_20251112_120000.txt", Body="t")
+    mocked_s3.put_object(Bucket=bucket, Key="EW01_met_20251113_235056.txt", Body="t")
+    mocked_s3.put_object(Bucket=bucket, Key="EW01_ADCP_20251113_235056.txt", Body="t")
+
+    defs = defs_for_dataset(dataset_config, s3_sensor=False)
+    with pytest.raises(KeyError):
+        test_utils.get_sensor_by_name(defs, "empire_met_s3_sensor")
+
+    sensor = bucket_sensor(bucket, [DatasetKeyWatcher(dataset_config)], defs.jobs)
+    assert sensor.name == "ott_empire_bucket_s3_sensor"
+
+    context = dg.build_sensor_context(instance=dg.DagsterInstance.ephemeral())
+    run_requests = list(sensor(context, s3_credentials=s3_credentials))
+
+    assert [r.partition_key for r in run_requests] == ["2025-11-12", "2025-11-13"]
+    assert {r.job_name for r in run_requests} == {dataset_config.daily_job_name()}
+
+
+def test_bucket_sensor_with_source_prefix(dataset_config, mocked_s3, s3_credentials):
+    """Keys under a non-root prefix match, as listed keys don't start with a slash"""
+    bucket = "ott-empire"
+    mocked_s3.create_bucket(Bucket=bucket)
+    key = "data/EW01_met_20251112_120000.txt"  # gitleaks:allow
+    mocked_s3.put_object(Bucket=bucket, Key=key, Body="t")
+    mocked_s3.put_object(Bucket=bucket, Key="EW01_met_20251113_235056.txt", Body="t")
+
+    dataset_config.config.s3_source.prefix = "/data/"
+    watcher = DatasetKeyWatcher(dataset_config)
+    assert watcher.partition_date(key) == date(2025, 11, 12)
+
+    defs = defs_for_dataset(dataset_config, s3_sensor=False)
+    sensor = bucket_sensor(bucket, [watcher], defs.jobs)
+
+    context = dg.build_sensor_context(instance=dg.DagsterInstance.ephemeral())
+    run_requests = list(sensor(context, s3_credentials=s3_credentials))
+
+    assert [r.partition_key for r in run_requests] == ["2025-11-12"]
+
+
+def test_future_dated_keys_dont_move_listing_window(dataset_config):
+    """A misnamed file far in the future doesn't hide later files of known partitions"""
+    watcher = DatasetKeyWatcher(dataset_config)
+    modified = datetime(2025, 11, 13, tzinfo=UTC)
+    matched = [
+        (
+            {"Key": "EW01_met_20251112_120000.txt", "LastModified": modified},
+            date(2025, 11, 12),
+        ),
+        (
+            {"Key": "EW01_met_20991231_000000.txt", "LastModified": modified},
+            date(2099, 12, 31),
+        ),
+    ]
+    for obj, _ in matched:
+        obj["ETag"] = '"1"'
+
+    state = watcher.advance(SensorCursor(), matched)
+
+    _, last_partition = watcher.partition_range()
+    assert state.latest_partition == last_partition
+    assert watcher.start_after(state) < f"EW01_met_{last_partition:%Y%m%d}_000000.txt"
+
+
+def test_bucket_sensor_seeds_cursor_for_datasets_that_have_run(
+    dataset_config,
+    mocked_s3,
+    s3_credentials,
+    s3_resource,
+    datastore,
+):
+    """Existing files don't trigger a backfill when taking over from an earlier sensor"""
+    bucket = "ott-empire"
+    mocked_s3.create_bucket(Bucket=bucket)
+    mocked_s3.put_object(Bucket=bucket, Key="EW01_met_20251112_120000.txt", Body="t")
+
+    defs = defs_for_dataset(dataset_config, s3_sensor=False)
+    sensor = bucket_sensor(bucket, [DatasetKeyWatcher(dataset_config)], defs.jobs)
+
+    instance = dg.DagsterInstance.ephemeral()
+    instance.add_run(
+        dg.DagsterRun(
+            job_name=dataset_config.daily_job_name(),
+            status=dg.DagsterRunStatus.SUCCESS,
+        ),
+    )
+
+    _, io_managers = io.common_resources("s3_timeseries", datastore=datastore)
+    resources = {"s3_credentials": s3_credentials}
+    definitions = dg.Definitions.merge(
+        defs,
+        dg.Definitions(
+            sensors=[sensor],
+            resources={**resources, "s3fs": s3_resource, **io_managers},
+        ),
+    )
+    seeded = sensor.evaluate_tick(
+        dg.build_sensor_context(
+            instance=instance,
+            definitions=definitions,
+            resources=resources,
+        ),
+    )
+    assert seeded.run_requests == []
+
+    state = BucketSensorCursor.from_cursor(seeded.cursor).datasets["empire_met"]
+    assert state.latest_partition == date(2025, 11, 12)
+
+    result = sensor.evaluate_tick(
+        dg.build_sensor_context(
+            instance=instance,
+            cursor=seeded.cursor,
+            definitions=definitions,
+            resources=resources,
+        ),
+    )
+    assert result.run_requests == []
+
+
+def test_bucket_sensor_skips_partitions_run_since_files_arrived(
+    dataset_config,
+    mocked_s3,
+    s3_credentials,
+):
+    """Files that already triggered a run, e.g. from SQS, aren't run again"""
+    bucket = "ott-empire"
+    mocked_s3.create_bucket(Bucket=bucket)
+    mocked_s3.put_object(Bucket=bucket, Key="EW01_met_20251112_120000.txt", Body="t")
+    mocked_s3.put_object(Bucket=bucket, Key="EW01_met_20251113_235056.txt", Body="t")
+
+    defs = defs_for_dataset(dataset_config, s3_sensor=False)
+    sensor = bucket_sensor(bucket, [DatasetKeyWatcher(dataset_config)], defs.jobs)
+
+    instance = dg.DagsterInstance.ephemeral()
+    instance.add_run(
+        dg.DagsterRun(
+            job_name=dataset_config.daily_job_name(),
+            status=dg.DagsterRunStatus.SUCCESS,
+            tags={"dagster/partition": "2025-11-12"},
+        ),
+    )
+
+    cursor = BucketSensorCursor(datasets={"empire_met": SensorCursor()})
+    context = dg.build_sensor_context(instance=instance, cursor=cursor.to_cursor())
+    run_requests = list(sensor(context, s3_credentials=s3_credentials))
+
+    assert [r.partition_key for r in run_requests] == ["2025-11-13"]
+
+
+def test_in_flight_partitions_stay_pending(dataset_config):
+    """Files that land while a partition is running are requested after the run"""
+    watcher = DatasetKeyWatcher(dataset_config)
+    day = date(2025, 11, 12)
+    first_seen = datetime.now(UTC) - timedelta(minutes=5)
+    state = SensorCursor()
+    state.add_pending(day, "v1", first_seen)
+
+    running = dg.DagsterInstance.ephemeral()
+    running.add_run(
+        dg.DagsterRun(
+            job_name=dataset_config.daily_job_name(),
+            status=dg.DagsterRunStatus.STARTED,
+            tags={"dagster/partition": day.isoformat()},
+        ),
+    )
+    context = dg.build_sensor_context(instance=running)
+    assert watcher.run_requests(context, state, {day: "v2"}) == []
+    assert state.pending[day].first_seen == first_seen
+    assert state.pending[day].version == "v2"
+
+    finished = dg.build_sensor_context(instance=dg.DagsterInstance.ephemeral())
+    run_requests = watcher.run_requests(finished, state, {})
+    assert [r.run_key for r in run_requests] == [f"empire_met_{day}_v2"]
+    assert state.pending == {}
+
+
+def test_queue_sensor(dataset_config, mocked_s3, s3_credentials):
+    bucket = "ott-empire"
+    sqs = boto3.client("sqs", region_name="us-east-1")
+    queue_url = sqs.create_queue(QueueName="ott-empire-events")["QueueUrl"]
+    queue_arn = sqs.get_queue_attributes(
+        QueueUrl=queue_url,
+        AttributeNames=["QueueArn"],
+    )["Attributes"]["QueueArn"]
+
+    mocked_s3.create_bucket(Bucket=bucket)
+    mocked_s3.put_bucket_notification_configuration(
+        Bucket=bucket,
+        NotificationConfiguration={
+            "QueueConfigurations": [
+                {"QueueArn": queue_arn, "Events": ["s3:ObjectCreated:*"]},
+            ],
+        },
+    )
+    mocked_s3.put_object(Bucket=bucket, Key="EW01_met_20251112_120000.txt", Body="t")
+    mocked_s3.put_object(Bucket=bucket, Key="EW01_met_20251112_121000.txt", Body="t")
+    mocked_s3.put_object(Bucket=bucket, Key="EW01_met_20251113_235056.txt", Body="t")
+    mocked_s3.put_object(Bucket=bucket, Key="EW01_ADCP_20251113_235056.txt", Body="t")
+
+    defs = defs_for_dataset(dataset_config, s3_sensor=False)
+    sensor = queue_sensor(queue_url, [DatasetKeyWatcher(dataset_config)], defs.jobs)
+    assert sensor.name == "ott_empire_events_sqs_sensor"
+
+    context = dg.build_sensor_context(instance=dg.DagsterInstance.ephemeral())
+    run_requests = list(sensor(context, s3_credentials=s3_credentials))
+
+    # Both files for the 12th are coalesced into one run
+    assert sorted(r.partition_key for r in run_requests) == [
+        "2025-11-12",
+        "2025-11-13",
+    ]
+    assert "Messages" not in sqs.receive_message(QueueUrl=queue_url)
+
+
 @pytest.mark.aws
-def test_daily_asset(defs, dataset_config, s3_resource):
+def test_daily_asset(defs, dataset_config, s3_resource, datastore):
     daily_df = test_utils.get_asset_by_name(defs, "daily_df")
     spec = daily_df.get_asset_spec()
 
@@ -62,7 +288,7 @@ def test_daily_asset(defs, dataset_config, s3_resource):
 
     context = dg.build_asset_context(partition_key="2025-11-13")
 
-    df = daily_df(context, s3fs=s3_resource)
+    df = daily_df(context, s3fs=s3_resource, datastore=datastore)
 
     assert isinstance(df, pd.DataFrame)
     assert not df.empty
@@ -133,3 +359,28 @@ def test_monthly_asset_with_nans(defs, dataset_config):
     snapshot = xr.load_dataset(snapshot_path)
 
     xr.testing.assert_equal(ds, snapshot)
+
+
+def test_monthly_asset_infers_numeric_columns_each_run(defs):
+    """A column that wasn't numeric in one run is still converted in the next"""
+    monthly_ds = test_utils.get_asset_by_name(defs, "monthly_ds")
+    daily = pd.read_csv(
+        TEST_DATA_DIR / "empire_met/2025-10-12.csv",
+        parse_dates=["datetime"],
+    )
+
+    first_context = dg.build_asset_context(partition_key="2025-10-01")
+    monthly_ds(first_context, daily_df={"2025-10-12": daily.assign(status="ok")})
+    first_failures = first_context.get_output_metadata("result")[
+        "Numeric conversion failures"
+    ]
+
+    second_context = dg.build_asset_context(partition_key="2025-10-01")
+    ds = monthly_ds(second_context, daily_df={"2025-10-12": daily.assign(status="1")})
+    second_failures = second_context.get_output_metadata("result")[
+        "Numeric conversion failures"
+    ]
+
+    assert "status" in first_failures.data
+    assert second_failures.data == {}
+    assert pd.api.types.is_numeric_dtype(ds["status"].dtype)
@@ -0,0 +1,231 @@
+import json
+from datetime import UTC, date, datetime, timedelta
+
+import boto3
+import dagster as dg
+import pytest
+from moto import mock_aws
+from pydantic import ValidationError
+
+from pipeline import DayGlob, in_flight_partitions
+
+from s3_listing import (
+    DayPatternMatcher,
+    PatternIndex,
+    RunCoalescing,
+    SensorCursor,
+    later_sequencer,
+    list_objects,
+    queue_region,
+    s3_event_records,
+)
+
+
+def test_start_after_key():
+    pattern = DayGlob(day_pattern="EW01_met_{partition_date:%Y%m%d}_*.txt")
+    assert pattern.start_after_key(date(2025, 11, 10)) == "EW01_met_20251110"
+
+
+def test_start_after_key_unsortable():
+    assert (
+        DayGlob(day_pattern="met_{partition_date:%d%m%Y}.txt").start_after_key(
+            date(2025, 11, 10),
+        )
+        is None
+    )
+    assert (
+        DayGlob(day_pattern="*_met_{partition_date:%Y%m%d}.txt").start_after_key(
+            date(2025, 11, 10),
+        )
+        is None
+    )
+
+
+def test_cursor_from_legacy_iso_string():
+    state = SensorCursor.from_cursor("2025-11-12T23:50:56+00:00")
+    assert state.last_modified == datetime(2025, 11, 12, 23, 50, 56, tzinfo=UTC)
+    assert state.latest_partition == date(2025, 11, 12)
+    assert state.etags == {}
+
+    assert SensorCursor.from_cursor(state.to_cursor()) == state
+
+
+def test_cursor_notices_rewritten_keys():
+    state = SensorCursor(
+        last_modified=datetime(2025, 11, 13, tzinfo=UTC),
+        etags={"a.txt": '"1"'},
+    )
+    old = datetime(2025, 11, 12, tzinfo=UTC)
+
+    assert not state.is_new({"Key": "a.txt", "ETag": '"1"', "LastModified": old})
+    assert state.is_new({"Key": "a.txt", "ETag": '"2"', "LastModified": old})
+    assert not state.is_new({"Key": "b.txt", "ETag": '"1"', "LastModified": old})
+    assert state.is_new(
+        {
+            "Key": "c.txt",
+            "ETag": '"1"',
+            "LastModified": datetime(2025, 11, 14, tzinfo=UTC),
+        },
+    )
+
+
+def test_list_objects_start_after():
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="bucket")
+        for day in ["20251110", "20251111", "20251112"]:
+            client.put_object(Bucket="bucket", Key=f"met_{day}_0000.txt", Body="x")
+
+        keys = [
+            obj["Key"]
+            for obj in list_objects(
+                client,
+                bucket="bucket",
+                prefix="met_",
+                start_after="met_20251111",
+            )
+        ]
+
+    assert keys == ["met_20251111_0000.txt", "met_20251112_0000.txt"]
+
+
+def test_in_flight_partitions_without_runs():
+    instance = dg.DagsterInstance.ephemeral()
+
+    assert in_flight_partitions(instance, "update_daily", []) == set()
+    assert in_flight_partitions(instance, "update_daily", ["2025-11-12"]) == set()
+
+
+def test_pattern_index_candidates():
+    index = PatternIndex()
+    index.add("EW01_met_", "met")
+    index.add("EW01_ADCP_", "adcp")
+    index.add("EW01_", "all")
+
+    assert index.candidates("EW01_met_20251112_0000.txt") == ["met", "all"]
+    assert index.candidates("EW02_met_20251112_0000.txt") == []
+
+
+def test_day_pattern_matcher():
+    matcher = DayGlob(day_pattern="EW01_met_{partition_date:%Y%m%d}_*.txt").matcher
+
+    assert matcher.literal_prefix == "EW01_met_"
+    assert matcher.match("EW01_met_20251112_120000.txt") == date(2025, 11, 12)
+    assert matcher.match("EW01_met_20251112_120000.csv") is None
+    assert matcher.match("EW01_met_20251312_120000.txt") is None
+    assert matcher.match("EW01_ADCP_20251112_120000.txt") is None
+
+    assert list(
+        matcher.match_many(["EW01_met_20251113_000000.txt", "README.md"]),
+    ) == [("EW01_met_20251113_000000.txt", date(2025, 11, 13))]
+    assert matcher.glob(date(2025, 11, 13)) == "EW01_met_20251113_*.txt"
+
+
+def test_day_pattern_matcher_day_of_year():
+    matcher = DayPatternMatcher("buoy/{partition_date:%Y-%j}.csv")
+    assert matcher.match("buoy/2024-060.csv") == date(2024, 2, 29)
+
+
+def test_day_pattern_matcher_unsupported_directive():
+    with pytest.raises(ValueError, match="%B"):
+        DayPatternMatcher("met_{partition_date:%B}.txt")
+
+
+def test_day_pattern_matcher_repeated_directive():
+    matcher = DayPatternMatcher(
+        "{partition_date:%Y}/met_{partition_date:%Y%m%d}_*.txt",
+    )
+    assert matcher.match("2025/met_20251112_1200.txt") == date(2025, 11, 12)
+    # Repeated date parts have to agree
+    assert matcher.match("2024/met_20251112_1200.txt") is None
+
+
+def test_day_glob_validates_pattern():
+    with pytest.raises(ValidationError, match="%B"):
+        DayGlob(day_pattern="met_{partition_date:%B}.txt")
+
+
+def test_s3_event_records():
+    record = {
+        "eventName": "ObjectCreated:Put",
+        "eventTime": "2025-11-12T12:00:00.000Z",
+        "s3": {
+            "bucket": {"name": "ott-empire"},
+            "object": {"key": "EW01+met_20251112.txt", "sequencer": "0A1B"},
+        },
+    }
+    removed = {**record, "eventName": "ObjectRemoved:Delete"}
+    body = json.dumps({"Records": [record, removed]})
+
+    expected = [
+        {"Bucket": "ott-empire", "Key": "EW01 met_20251112.txt", "Sequencer": "0A1B"},
+    ]
+    assert list(s3_event_records(body)) == expected
+
+    # Delivered through SNS
+    assert list(s3_event_records(json.dumps({"Message": body}))) == expected
+
+    assert list(s3_event_records(json.dumps({"Event": "s3:TestEvent"}))) == []
+
+
+def test_queue_region_and_sequencers():
+    assert (
+        queue_region("https://sqs.us-west-2.amazonaws.com/123456789012/events")
+        == "us-west-2"
+    )
+    assert later_sequencer(None, "0A") == "0A"
+    assert later_sequencer("FF", "0100") == "0100"
+
+
+def test_default_coalescing_is_immediate():
+    now = datetime(2025, 11, 12, 12, tzinfo=UTC)
+    state = SensorCursor()
+    state.add_pending(date(2025, 11, 12), "v1", now)
+
+    assert state.pop_due(RunCoalescing(), now) == {date(2025, 11, 12): "v1"}
+    assert state.pending == {}
+
+
+def test_coalescing_quiet_period_and_max_delay():
+    policy = RunCoalescing(quiet_period_minutes=15, max_delay_minutes=60)
+    day = date(2025, 11, 12)
+    start = datetime(2025, 11, 12, 12, tzinfo=UTC)
+    state = SensorCursor()
+
+    # Files keep arriving every 5 minutes, so the quiet period never passes
+    for minutes in range(0, 60, 5):
+        now = start + timedelta(minutes=minutes)
+        state.add_pending(day, f"v{minutes}", now)
+        assert state.pop_due(policy, now) == {}
+
+    # but the max delay does
+    now = start + timedelta(minutes=60)
+    state.add_pending(day, "v60", now)
+    assert state.pop_due(policy, now) == {day: "v60"}
+
+    state.add_pending(day, "v65", now + timedelta(minutes=5))
+    assert state.pop_due(policy, now + timedelta(minutes=19)) == {}
+    assert state.pop_due(policy, now + timedelta(minutes=20)) == {day: "v65"}
+
+
+def test_coalescing_max_runs_per_hour():
+    policy = RunCoalescing(max_runs_per_hour=2)
+    day = date(2025, 11, 12)
+    start = datetime(2025, 11, 12, 12, tzinfo=UTC)
+    state = SensorCursor()
+
+    requested = 0
+    for minutes in range(0, 60, 5):
+        now = start + timedelta(minutes=minutes)
+        state.add_pending(day, f"v{minutes}", now)
+        due = state.pop_due(policy, now)
+        state.record_runs(due, policy, now)
+        requested += len(due)
+
+    assert requested == 2
+    assert day in state.pending
+
+    # Still waiting after the cursor round trips
+    state = SensorCursor.from_cursor(state.to_cursor())
+    now = start + timedelta(minutes=61)
+    assert state.pop_due(policy, now) == {day: "v55"}